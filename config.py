@@ -6,6 +6,7 @@
   3. Streamlit Cloud: st.secrets (无文件系统)
 """
 import os
+from functools import lru_cache
 from pathlib import Path
 
 # ============== 路径配置 ==============
@@ -19,6 +20,7 @@ DATABASE_PATH = Path(os.getenv("DATABASE_PATH", str(DATA_DIR / "issues.db")))
 # ============== Google 凭证 ==============
 # 优先级: st.secrets > 环境变量 > 默认文件路径
 
+@lru_cache(maxsize=1)
 def _has_streamlit_secrets():
     """Check if running on Streamlit Cloud with secrets configured"""
     try:
@@ -27,11 +29,14 @@ def _has_streamlit_secrets():
     except Exception:
         return False
 
+@lru_cache(maxsize=1)
 def get_google_credentials():
     """
-    Get Google credentials object.
+    Get Google credentials object (cached per process).
     - Streamlit Cloud: from st.secrets["gcp_service_account"]
     - Docker / Local: from JSON file at CREDENTIALS_PATH
+    
+    A single instance is safe to reuse: google-auth refreshes the token itself.
     """
     from google.oauth2.service_account import Credentials
     
@@ -90,8 +95,11 @@ COLUMN_MAPPING = {
 # Dashboard 核心字段（MVP）
 CORE_FIELDS = ["date", "category", "progress", "problem_category"]
 
-# 所有字段
-ALL_FIELDS = list(COLUMN_MAPPING.values())
+# 所有字段 (不可变，import 时构建一次)
+ALL_FIELDS = tuple(COLUMN_MAPPING.values())
+
+# 数据库字段名 -> Google Sheets 列名
+REVERSE_COLUMN_MAPPING = {v: k for k, v in COLUMN_MAPPING.items()}
 
 # 显示名称映射 (用于 Dashboard UI)
 DISPLAY_NAMES = {
@@ -4,7 +4,6 @@ Run: streamlit run dashboard.py --server.port 8501 --server.address 0.0.0.0
 """
 
 import streamlit as st
-import pandas as pd
 from pathlib import Path
 from datetime import datetime, date
 import sys
@@ -13,13 +12,16 @@ import sys
 PROJECT_ROOT = Path(__file__).parent
 sys.path.insert(0, str(PROJECT_ROOT))
 
-from utils.db import (
-    get_all_issues, get_issues_count, get_last_sync,
-    get_unique_values, get_statistics, search_issues, filter_issues
-)
-from utils.common import normalize_progress, parse_date, style_progress
+# pandas / utils.db / utils.common are imported inside the render functions,
+# so the login page (check_auth) doesn't pay for them on cold start
 from utils.auth import check_auth
 
+# Low-cardinality issue columns stored as pandas Categorical
+CATEGORICAL_COLUMNS = ("progress", "progress_norm", "problem_category", "channel", "owner")
+
+# Wall-clock limit for the manual "Sync Now" button
+SYNC_TIMEOUT_SECONDS = 60
+
 # ============== Page Config ==============
 st.set_page_config(
     page_title="Discord Issue Dashboard",
@@ -30,7 +32,8 @@ st.set_page_config(
 
 
 # ============== Custom Styles ==============
-st.markdown("""
+# Page CSS: a module-level constant, nothing to build or cache per rerun
+_CUSTOM_CSS = """
 <style>
     /* Main title */
     .main-title {
@@ -79,25 +82,33 @@ st.markdown("""
         font-size: 0.9rem;
     }
 </style>
-""", unsafe_allow_html=True)
+"""
 
 
-def render_metrics():
-    """Render top metric cards"""
-    stats = get_statistics()
-    
-    # Normalize progress counts
-    normalized_progress = {}
-    for key, count in stats.get("by_progress", {}).items():
-        norm_key = normalize_progress(key)
-        normalized_progress[norm_key] = normalized_progress.get(norm_key, 0) + count
+# Must be emitted on every rerun: Streamlit drops elements a run doesn't
+# re-send, so a once-per-session guard would lose the styles after the first
+# widget interaction
+st.markdown(_CUSTOM_CSS, unsafe_allow_html=True)
+
+
+@st.cache_data(ttl=60, show_spinner=False)
+def _dashboard_stats(data_version):
+    """Total / by-status / by-problem-type counts from one GROUP BY (cached until next sync)"""
+    from utils.db import get_dashboard_stats
+    return get_dashboard_stats()
+
+
+def render_metrics(stats):
+    """Render top metric cards (stats: utils.db.DashboardStats)"""
+    # Progress counts are already normalized (progress_norm, written at sync)
+    normalized_progress = stats.by_progress
     
     col1, col2, col3, col4, col5 = st.columns(5)
     
     with col1:
         st.metric(
             label="📋 Total Issues",
-            value=stats["total"],
+            value=stats.total,
         )
     
     with col2:
@@ -124,8 +135,8 @@ def render_metrics():
     
     with col5:
         # Completion rate
-        if stats["total"] > 0:
-            completion_rate = round(done_count / stats["total"] * 100, 1)
+        if stats.total > 0:
+            completion_rate = round(done_count / stats.total * 100, 1)
         else:
             completion_rate = 0
         st.metric(
@@ -184,6 +195,8 @@ def render_filters():
     )
     
     # Problem Category filter (新增)
+    # get_unique_values caches per data version itself (utils.db), no st.cache_data layer
+    from utils.db import get_unique_values
     st.sidebar.markdown("**Problem Type**")
     problem_categories = get_unique_values("problem_category")
     problem_cat_options = ["All"] + problem_categories
@@ -203,7 +216,46 @@ def render_filters():
 
 
 
-# style_progress and parse_date imported from utils.common
+@st.cache_data(ttl=300, show_spinner=False)
+def _query_issues_df(keyword, progress, problem_category, data_version):
+    """
+    Issues matching the SQL-side filters, as a DataFrame.
+    Cached per filter combination; data_version is the cache key busted by sync.
+    """
+    from utils.db import filter_issues_df
+    df = filter_issues_df(
+        keyword=keyword or None,
+        progress=progress,
+        problem_category=problem_category,
+    )
+    
+    # Low-cardinality columns as Categorical: int codes instead of object
+    # pointers (smaller cache entries; Status styling maps categories only)
+    for col in CATEGORICAL_COLUMNS:
+        df[col] = df[col].astype("category")
+    
+    # Parse dates once per cache entry; filter_by_date reuses the column
+    # instead of re-running pd.to_datetime on every rerun
+    _parsed_dates(df)
+    return df
+
+
+def _parsed_dates(df):
+    """
+    Parsed `date` column as datetime64, computed once per DataFrame.
+    
+    Converted from the ISO `parsed_date` column written at sync time (one
+    fixed format, no multi-format parsing here). Stored as a hidden
+    `_parsed_date` column (not df.attrs, which pandas deep-copies into
+    every derived frame), so filtered slices reuse it.
+    """
+    import pandas as pd
+    
+    if "_parsed_date" not in df.columns:
+        df["_parsed_date"] = pd.to_datetime(
+            df["parsed_date"], format="%Y-%m-%d", errors="coerce"
+        )
+    return df["_parsed_date"]
 
 
 def filter_by_date(df, date_from, date_to):
@@ -211,99 +263,99 @@ def filter_by_date(df, date_from, date_to):
     if date_from is None and date_to is None:
         return df
     
+    import pandas as pd
+    from utils.common import parse_date
+    
     # Parse filter dates
     from_dt = parse_date(date_from) if date_from else None
     to_dt = parse_date(date_to) if date_to else None
     
-    def date_in_range(row_date):
-        parsed = parse_date(row_date)
-        if parsed is None:
-            return True  # Keep rows with unparseable dates
-        if from_dt and parsed < from_dt:
-            return False
-        if to_dt and parsed > to_dt:
-            return False
-        return True
+    parsed = _parsed_dates(df)
     
-    mask = df["date"].apply(date_in_range)
-    return df[mask]
+    # Keep rows with unparseable dates
+    mask = parsed.isna()
+    in_range = ~mask
+    if from_dt:
+        in_range &= parsed >= pd.Timestamp(from_dt)
+    if to_dt:
+        in_range &= parsed <= pd.Timestamp(to_dt)
+    return df[mask | in_range]
 
 
-def filter_by_progress(df, progress):
-    """Filter DataFrame by normalized progress value"""
-    if progress is None:
-        return df
-    
-    df["_normalized_progress"] = df["progress"].apply(normalize_progress)
-    filtered = df[df["_normalized_progress"] == progress].copy()
-    filtered = filtered.drop(columns=["_normalized_progress"])
-    return filtered
+def _truncate_text(series, max_len):
+    """Truncate long text to max_len chars + "..." (vectorized)"""
+    text = series.astype(str)
+    return series.where(text.str.len() <= max_len, text.str.slice(0, max_len) + "...")
 
 
-def filter_by_problem_category(df, problem_category):
-    """Filter DataFrame by problem_category"""
-    if problem_category is None:
-        return df
-    return df[df["problem_category"] == problem_category]
-
-
-def render_data_table(filters):
-    """Render data table"""
-    # Get data
-    if filters["keyword"]:
-        issues = search_issues(filters["keyword"])
-    else:
-        issues = get_all_issues()
-    
-    if not issues:
-        st.info("No data found")
-        return
+def _build_table(filters, data_version):
+    """
+    Query + filter + format the issue table.
+    Returns (df_display, None), or (None, message) when there is nothing to show.
+    """
+    # Keyword / progress / problem category are filtered in SQL
+    # (cached until the database file changes)
+    df = _query_issues_df(
+        filters["keyword"],
+        filters["progress"],
+        filters.get("problem_category"),
+        data_version,
+    )
     
-    # Convert to DataFrame
-    df = pd.DataFrame(issues)
+    if df.empty:
+        return None, "No data found"
     
-    # Apply date filter
+    # Date filter stays in pandas: the table keeps rows whose date can't be
+    # parsed, while the SQL parsed_date filter would drop them
     df = filter_by_date(df, filters["date_from"], filters["date_to"])
     
-    # Apply progress filter
-    df = filter_by_progress(df, filters["progress"])
-    
-    # Apply problem category filter
-    if "problem_category" in df.columns:
-        df = filter_by_problem_category(df, filters.get("problem_category"))
-    
     if df.empty:
-        st.info("No matching records found")
-        return
+        return None, "No matching records found"
     
     # Select display columns - 增加 problem_category
     # problem_category = Problem Type (大类)
     # category = Issue Details (具体描述)
     if "problem_category" in df.columns:
-        display_columns = ["date", "problem_category", "category", "progress"]
-        df_display = df[display_columns].copy()
-        df_display["progress"] = df_display["progress"].apply(normalize_progress)
-        df_display.columns = ["Date", "Problem Type", "Issue Details", "Status"]
+        display_columns = ["date", "problem_category", "category", "progress_norm"]
+        df_display = df[display_columns].set_axis(["Date", "Problem Type", "Issue Details", "Status"], axis=1)
         # Truncate long text
-        df_display["Issue Details"] = df_display["Issue Details"].apply(
-            lambda x: (str(x)[:60] + "...") if len(str(x)) > 60 else x
-        )
+        df_display["Issue Details"] = _truncate_text(df_display["Issue Details"], 60)
     else:
-        display_columns = ["date", "category", "progress"]
-        df_display = df[display_columns].copy()
-        df_display["progress"] = df_display["progress"].apply(normalize_progress)
-        df_display.columns = ["Date", "Category", "Status"]
-        df_display["Category"] = df_display["Category"].apply(
-            lambda x: (str(x)[:80] + "...") if len(str(x)) > 80 else x
-        )
+        display_columns = ["date", "category", "progress_norm"]
+        df_display = df[display_columns].set_axis(["Date", "Category", "Status"], axis=1)
+        df_display["Category"] = _truncate_text(df_display["Category"], 80)
+    
+    return df_display, None
+
+
+def render_data_table(filters):
+    """Render data table"""
+    from utils.db import get_data_version
+    from utils.common import PROGRESS_STYLES
+    
+    # Reruns that don't touch the filters (e.g. opening an expander) reuse the
+    # table built for the same filters + database version in this session
+    key = (tuple(sorted(filters.items())), get_data_version())
+    cached = st.session_state.get("_last_table")
+    if cached is not None and cached[0] == key:
+        df_display, message = cached[1]
+    else:
+        df_display, message = _build_table(filters, key[1])
+        st.session_state["_last_table"] = (key, (df_display, message))
+    
+    if df_display is None:
+        st.info(message)
+        return
     
     # Show record count
     st.markdown(f"**{len(df_display)} records found**")
     
     # Apply styles and display
-    styled_df = df_display.style.applymap(
-        style_progress, 
-        subset=["Status"]
+    # Status is already normalized, so the whole column is styled with one
+    # vectorized dict lookup (Styler.apply) instead of a per-cell callback
+    styled_df = df_display.style.apply(
+        lambda col: col.map(PROGRESS_STYLES).fillna(""),
+        subset=["Status"],
     )
     
     st.dataframe(
@@ -329,45 +381,90 @@ def _auto_sync_on_startup():
         logging.getLogger("discord_dashboard").warning(f"Auto-sync on startup failed: {e}")
 
 
+@st.cache_resource(show_spinner=False)
+def _sync_lock():
+    """Process-wide lock so only one manual sync runs at a time (shared across sessions)"""
+    import threading
+    return threading.Lock()
+
+
 def run_sync():
-    """Run data sync from Google Sheets"""
-    import subprocess
+    """
+    Run data sync from Google Sheets (in-process, reuses cached credentials).
+    Returns (success, log output captured from the "sync" logger).
+    
+    The sync runs in a worker thread with a SYNC_TIMEOUT_SECONDS wall-clock
+    deadline, so a hung HTTP call can't block the script thread. A sync that
+    times out keeps running in the background and holds the lock until it ends.
+    """
+    import io
+    import logging
+    import threading
+    from concurrent.futures import ThreadPoolExecutor, TimeoutError as FutureTimeout
+    
+    lock = _sync_lock()
+    if not lock.acquire(blocking=False):
+        return False, "Another sync is already running"
+    
+    buffer = io.StringIO()
+    handler = logging.StreamHandler(buffer)
+    handler.setFormatter(logging.Formatter("%(asctime)s [%(levelname)s] %(message)s", datefmt="%H:%M:%S"))
+    
     try:
-        result = subprocess.run(
-            [sys.executable, "scripts/sync_google_sheets.py"],
-            cwd=PROJECT_ROOT,
-            capture_output=True,
-            text=True,
-            timeout=60,
-        )
-        return result.returncode == 0, result.stdout + result.stderr
-    except subprocess.TimeoutExpired:
-        return False, "Sync timeout (>60s)"
+        from scripts.sync_google_sheets import sync, logger as sync_logger
     except Exception as e:
+        lock.release()
         return False, str(e)
+    
+    def _run():
+        # The sync logger is process-global: only capture this worker's records
+        ident = threading.get_ident()
+        handler.addFilter(lambda record: record.thread == ident)
+        sync_logger.addHandler(handler)
+        try:
+            return sync()
+        finally:
+            sync_logger.removeHandler(handler)
+            lock.release()
+    
+    executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="manual-sync")
+    future = executor.submit(_run)
+    executor.shutdown(wait=False)  # don't join a timed-out worker
+    
+    try:
+        return future.result(timeout=SYNC_TIMEOUT_SECONDS), buffer.getvalue()
+    except FutureTimeout:
+        return False, f"Sync timeout (>{SYNC_TIMEOUT_SECONDS}s)"
+    except Exception as e:
+        return False, buffer.getvalue() + str(e)
+
+
+@st.cache_resource(show_spinner=False)
+def _gspread_spreadsheet():
+    """Authorized gspread Spreadsheet handle (process lifetime, survives reruns)"""
+    import gspread
+    from config import get_google_credentials, SPREADSHEET_ID
+    
+    gc = gspread.authorize(get_google_credentials())
+    return gc.open_by_key(SPREADSHEET_ID)
 
 
 @st.cache_data(ttl=300)  # 缓存 5 分钟
 def get_sheets_last_update():
     """Get Google Sheets last update time via Sheets API"""
     try:
-        import gspread
         from datetime import datetime
         
-        from config import get_google_credentials, SPREADSHEET_ID
-        
-        credentials = get_google_credentials()
-        gc = gspread.authorize(credentials)
-        spreadsheet = gc.open_by_key(SPREADSHEET_ID)
+        spreadsheet = _gspread_spreadsheet()
         
         # 获取最后更新时间 (UTC)
-        last_update_str = spreadsheet.lastUpdateTime  # ISO 格式: 2026-02-05T08:08:17.944Z
+        # 注意: lastUpdateTime 属性只在 open 时读取一次，缓存的 handle 需用 get_lastUpdateTime() 实时拉取
+        last_update_str = spreadsheet.get_lastUpdateTime()  # ISO 格式: 2026-02-05T08:08:17.944Z
         
         # 解析并转换为本地时间显示
         if last_update_str:
-            # 去掉毫秒和 Z
-            dt_str = last_update_str.replace('Z', '+00:00')
-            dt_utc = datetime.fromisoformat(dt_str.split('.')[0])
+            # Python 3.11+ fromisoformat 直接支持 "Z" 和毫秒
+            dt_utc = datetime.fromisoformat(last_update_str)
             # 返回格式化的字符串
             return dt_utc.strftime("%Y-%m-%d %H:%M:%S") + " UTC"
         return None
@@ -402,7 +499,8 @@ def render_sync_status():
         st.sidebar.markdown(f"**📄 Sheet updated:** {sheets_update}")
     
     # Show last sync info
-    last_sync = get_last_sync()
+    from utils.db import get_last_sync_cached
+    last_sync = get_last_sync_cached()
     if last_sync:
         # Format time nicely
         sync_time = last_sync['sync_time']
@@ -431,20 +529,22 @@ def main():
     st.markdown("---")
     
     # Ensure database exists (critical for Streamlit Cloud where data/ doesn't persist)
-    from utils.db import init_database
+    from utils.db import init_database, get_data_version
     init_database()
     
     # Auto-sync on startup if database is empty (important for Streamlit Cloud)
-    if get_issues_count() == 0:
+    stats = _dashboard_stats(get_data_version())
+    if stats.total == 0:
         with st.spinner("Syncing data from Google Sheets (first load)..."):
             _auto_sync_on_startup()
+        stats = _dashboard_stats(get_data_version())
     
-    if get_issues_count() == 0:
+    if stats.total == 0:
         st.warning("⚠️ Database is empty. Sync failed or not yet run.")
         return
     
     # Top metrics
-    render_metrics()
+    render_metrics(stats)
     
     st.markdown("---")
     
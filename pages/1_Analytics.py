@@ -14,9 +14,9 @@ import sys
 PROJECT_ROOT = Path(__file__).parent.parent
 sys.path.insert(0, str(PROJECT_ROOT))
 
-from utils.db import get_all_issues
+from utils.db import get_connection, get_data_version
 from utils.common import (
-    normalize_progress, parse_date,
+    get_period_range, lttb_indices,
     PROGRESS_COLORS, PROBLEM_CATEGORY_COLORS,
 )
 from utils.auth import check_auth
@@ -29,82 +29,76 @@ st.set_page_config(
 )
 
 
-def get_period_range(mode, custom_start=None, custom_end=None):
+# Columns the Analytics charts read (the rest of the issues table is never loaded here);
+# parsed_date is the ISO date written at sync time
+ANALYTICS_COLUMNS = ("parsed_date", "progress_norm", "channel", "problem_category")
+
+# Trend chart: above this many days, downsample (LTTB) to TREND_MAX_POINTS for the browser
+TREND_DOWNSAMPLE_THRESHOLD = 2000
+TREND_MAX_POINTS = 1000
+
+# Low-cardinality columns stored as pandas category (int codes instead of Python strings)
+CATEGORICAL_COLUMNS = ("progress_norm", "channel", "problem_category")
+
+
+@st.cache_data(ttl=300, show_spinner=False)
+def load_issues_df(data_version):
     """
-    Get current period and comparison period date ranges.
-    
-    Day/Week/Month: 最新周期 vs 上一个周期 (固定)
-    Custom: 任意日期范围 vs 前一个同等长度的周期
-    
-    Returns: (current_start, current_end, prev_start, prev_end, period_label, compare_label)
+    All issues as a DataFrame with a parsed `_parsed` datetime column, sorted by it
+    (unparseable dates last). Cached across reruns; data_version is the cache key,
+    so a sync invalidates it.
     """
-    today = date.today()
-    
-    if mode == "Day":
-        current_start = today
-        current_end = today
-        prev_start = today - timedelta(days=1)
-        prev_end = today - timedelta(days=1)
-        period_label = f"{today.strftime('%b %d, %Y')}"
-        compare_label = f"{prev_start.strftime('%b %d, %Y')}"
-        
-    elif mode == "Week":
-        # This week (Monday to today)
-        days_since_monday = today.weekday()
-        current_start = today - timedelta(days=days_since_monday)
-        current_end = today
-        # Last week (Monday to Sunday)
-        prev_start = current_start - timedelta(days=7)
-        prev_end = current_start - timedelta(days=1)
-        period_label = f"{current_start.strftime('%b %d')} - {current_end.strftime('%b %d, %Y')}"
-        compare_label = f"{prev_start.strftime('%b %d')} - {prev_end.strftime('%b %d, %Y')}"
-        
-    elif mode == "Month":
-        # This month
-        current_start = today.replace(day=1)
-        current_end = today
-        # Last month
-        last_month_end = current_start - timedelta(days=1)
-        prev_start = last_month_end.replace(day=1)
-        prev_end = last_month_end
-        period_label = f"{current_start.strftime('%b %Y')}"
-        compare_label = f"{prev_start.strftime('%b %Y')}"
-        
-    else:  # Custom - 任意日期范围，对比前一个同等长度周期
-        current_start = custom_start or (today - timedelta(days=6))
-        current_end = custom_end or today
-        # 计算选定范围的天数，向前推同等长度
-        span = (current_end - current_start).days + 1  # 包含首尾
-        prev_end = current_start - timedelta(days=1)
-        prev_start = prev_end - timedelta(days=span - 1)
-        period_label = f"{current_start.strftime('%b %d')} - {current_end.strftime('%b %d, %Y')} ({span} days)"
-        compare_label = f"{prev_start.strftime('%b %d')} - {prev_end.strftime('%b %d, %Y')} ({span} days)"
-    
-    return current_start, current_end, prev_start, prev_end, period_label, compare_label
+    # read_sql_query builds the columns straight from the cursor (no list of dicts);
+    # the ISO parsed_date converts with one fixed format (NULL -> NaT)
+    with get_connection() as conn:
+        df = pd.read_sql_query(
+            f"SELECT {', '.join(ANALYTICS_COLUMNS)} FROM issues",
+            conn,
+            parse_dates={"parsed_date": {"format": "%Y-%m-%d", "errors": "coerce"}},
+        )
+    if df.empty:
+        return df
+    # period filters and the trend chart read the parsed dates as `_parsed`
+    df = df.rename(columns={"parsed_date": "_parsed"})
+    df = df.astype({col: "category" for col in CATEGORICAL_COLUMNS})
+    # Sorted so filter_by_date_range can binary-search instead of scanning
+    return df.sort_values("_parsed", kind="stable", ignore_index=True)
+
+
+def value_counts(series):
+    """
+    series.value_counts() without the zero-count rows a categorical column
+    reports for categories absent from the slice; labels come back as plain values.
+    """
+    counts = series.value_counts()
+    counts = counts[counts > 0]
+    counts.index = counts.index.astype(object)
+    return counts
 
 
 def filter_by_date_range(df, start_date, end_date):
-    """Filter DataFrame by date range"""
-    def in_range(row_date):
-        parsed = parse_date(row_date)
-        if parsed is None:
-            return False
-        d = parsed.date()
-        return start_date <= d <= end_date
-    
-    return df[df["date"].apply(in_range)]
+    """
+    Filter DataFrame by date range (inclusive, by calendar day).
+    Expects df sorted by `_parsed` (see load_issues_df): two binary searches and
+    a positional slice. Unparseable dates (NaT, sorted last) are excluded.
+    """
+    lo, hi = df["_parsed"].searchsorted([
+        pd.Timestamp(start_date),
+        pd.Timestamp(end_date) + pd.Timedelta(days=1),
+    ])
+    return df.iloc[lo:hi]
 
 
 def calculate_stats(df):
     """Calculate statistics for a DataFrame"""
-    df = df.copy()
-    df["normalized_progress"] = df["progress"].apply(normalize_progress)
+    # progress_norm is written at sync time; one value_counts pass covers all statuses
+    counts = df["progress_norm"].value_counts()
     
     total = len(df)
-    done = len(df[df["normalized_progress"] == "Done"])
-    in_progress = len(df[df["normalized_progress"] == "In Progress"])
-    pending = len(df[df["normalized_progress"] == "Pending"])
-    blocked = len(df[df["normalized_progress"] == "Blocked"])
+    done = int(counts.get("Done", 0))
+    in_progress = int(counts.get("In Progress", 0))
+    pending = int(counts.get("Pending", 0))
+    blocked = int(counts.get("Blocked", 0))
     rate = (done / total * 100) if total > 0 else 0
     
     return {
@@ -239,22 +233,39 @@ def render_comparison_metrics(current_stats, prev_stats, period_label, compare_l
         """)
 
 
-def render_progress_chart(df, period_label):
-    """Render progress distribution (pie chart)"""
-    st.subheader("📊 Progress Distribution")
-    st.caption(f"Period: {period_label}")
-    
-    df = df.copy()
-    df["normalized_progress"] = df["progress"].apply(normalize_progress)
-    
-    progress_counts = df["normalized_progress"].value_counts().reset_index()
+@st.cache_data(ttl=300, show_spinner=False)
+def daily_counts_series(data_version):
+    """
+    Issues per calendar day (Series indexed by day, sorted), over all dates.
+    Independent of the trend range, so it is computed once per data_version and sliced.
+    """
+    parsed = load_issues_df(data_version)["_parsed"]
+    return parsed.dropna().dt.normalize().value_counts().sort_index()
+
+
+def period_df(data_version, start_date, end_date):
+    """Issues dated within [start_date, end_date], from the cached DataFrame."""
+    return filter_by_date_range(load_issues_df(data_version), start_date, end_date)
+
+
+# Figure builders are cached on (data_version, start, end) — the period slice is
+# fully determined by those, so a widget rerun with the same range reuses the
+# figure instead of rebuilding it. Each returns None when there is nothing to plot.
+
+@st.cache_data(ttl=300, max_entries=32, show_spinner=False)
+def build_progress_fig(data_version, start_date, end_date):
+    """Progress distribution (pie chart)"""
+    df = period_df(data_version, start_date, end_date)
+    if df.empty:  # e.g. Day mode with no issues yet: skip the counting work
+        return None
+    
+    progress_counts = value_counts(df["progress_norm"]).reset_index()
     progress_counts.columns = ["Progress", "Count"]
     
     if progress_counts.empty:
-        st.info("No data for this period")
-        return
+        return None
     
-    colors = [PROGRESS_COLORS.get(p, "#9ca3af") for p in progress_counts["Progress"]]
+    colors = progress_counts["Progress"].map(PROGRESS_COLORS).fillna("#9ca3af").tolist()
     
     fig = go.Figure(data=[go.Pie(
         labels=progress_counts["Progress"],
@@ -271,21 +282,21 @@ def render_progress_chart(df, period_label):
         legend=dict(orientation="h", yanchor="bottom", y=-0.2, xanchor="center", x=0.5),
         margin=dict(t=20, b=20),
     )
-    
-    st.plotly_chart(fig, use_container_width=True)
+    return fig
 
 
-def render_channel_chart(df, period_label):
-    """Render channel distribution (bar chart)"""
-    st.subheader("📊 Issues by Channel")
-    st.caption(f"Period: {period_label} (Top 10)")
-    
-    channel_counts = df["channel"].value_counts().head(10).reset_index()
+@st.cache_data(ttl=300, max_entries=32, show_spinner=False)
+def build_channel_fig(data_version, start_date, end_date):
+    """Channel distribution, top 10 (bar chart)"""
+    df = period_df(data_version, start_date, end_date)
+    if df.empty:
+        return None
+    
+    channel_counts = value_counts(df["channel"]).head(10).reset_index()
     channel_counts.columns = ["Channel", "Count"]
     
     if channel_counts.empty:
-        st.info("No channel data for this period")
-        return
+        return None
     
     fig = px.bar(
         channel_counts,
@@ -306,11 +317,159 @@ def render_channel_chart(df, period_label):
     )
     
     fig.update_coloraxes(showscale=False)
+    return fig
+
+
+@st.cache_data(ttl=300, max_entries=32, show_spinner=False)
+def build_trend_fig(data_version, start_date=None, end_date=None):
+    """
+    Daily issue counts (line chart) between start_date and end_date; None = open bound.
+    Returns (fig, caption), or (None, None) when no dated issues fall in the range.
+    """
+    start = pd.Timestamp(start_date) if start_date is not None else None
+    end = pd.Timestamp(end_date) if end_date is not None else None
+    daily = daily_counts_series(data_version).loc[start:end]
+    
+    if daily.empty:
+        return None, None
+    
+    # daily is sorted by day, so the range ends are the first / last index entries
+    date_min, date_max = daily.index[0], daily.index[-1]
+    caption = f"Showing: {date_min.strftime('%b %d, %Y')} - {date_max.strftime('%b %d, %Y')} ({len(daily)} days with data)"
+    
+    # Long histories: keep the line's shape with a bounded number of points
+    if len(daily) > TREND_DOWNSAMPLE_THRESHOLD:
+        daily = daily.iloc[lttb_indices(daily.index.asi8, daily.to_numpy(), TREND_MAX_POINTS)]
+        caption += f", {len(daily)} points shown"
+    
+    # WebGL trace: long "All time" histories stay fast to draw and hover
+    fig = go.Figure(go.Scattergl(
+        x=daily.index,
+        y=daily.to_numpy(),
+        mode="lines+markers",
+        line=dict(color="#667eea", width=2),
+        marker=dict(color="#667eea", size=8),
+        hovertemplate="Date=%{x|%Y-%m-%d}<br>Number of Issues=%{y}<extra></extra>",
+    ))
+    
+    fig.update_layout(
+        xaxis_title="Date",
+        yaxis_title="Issues",
+        hovermode="x unified",
+        height=350,
+        margin=dict(t=20, b=20),
+    )
+    return fig, caption
+
+
+@st.cache_data(ttl=300, max_entries=32, show_spinner=False)
+def build_problem_category_fig(data_version, start_date, end_date):
+    """Problem category distribution (pie chart)"""
+    df = period_df(data_version, start_date, end_date)
+    if df.empty:
+        return None
+    
+    # Filter out empty values (only the one column is needed, no frame copy)
+    problem = df["problem_category"]
+    problem = problem[problem.notna() & (problem != "")]
+    
+    if problem.empty:
+        return None
+    
+    problem_counts = value_counts(problem).reset_index()
+    problem_counts.columns = ["Problem Type", "Count"]
+    
+    # Get colors
+    colors = problem_counts["Problem Type"].map(PROBLEM_CATEGORY_COLORS).fillna("#6b7280").tolist()
+    
+    fig = go.Figure(data=[go.Pie(
+        labels=problem_counts["Problem Type"],
+        values=problem_counts["Count"],
+        marker_colors=colors,
+        hole=0.4,
+        textinfo="label+percent",
+        textposition="outside",
+    )])
+    
+    fig.update_layout(
+        height=350,
+        showlegend=True,
+        legend=dict(orientation="h", yanchor="bottom", y=-0.2, xanchor="center", x=0.5),
+        margin=dict(t=20, b=20),
+    )
+    return fig
+
+
+@st.cache_data(ttl=300, max_entries=32, show_spinner=False)
+def build_problem_category_progress_fig(data_version, start_date, end_date):
+    """Problem category by progress (stacked bar chart)"""
+    df = period_df(data_version, start_date, end_date)
+    if df.empty:
+        return None
+    
+    df_valid = df[df["problem_category"].notna() & (df["problem_category"] != "")]
+    
+    if df_valid.empty:
+        return None
+    
+    # Group by problem_category and (normalized) progress
+    grouped = (
+        df_valid.groupby(["problem_category", "progress_norm"], observed=True)
+        .size()
+        .reset_index(name="count")
+        .astype({"problem_category": object, "progress_norm": object})
+    )
+    
+    fig = px.bar(
+        grouped,
+        x="problem_category",
+        y="count",
+        color="progress_norm",
+        color_discrete_map=PROGRESS_COLORS,
+        barmode="stack",
+        labels={
+            "problem_category": "Problem Type",
+            "count": "Number of Issues",
+            "progress_norm": "Status"
+        }
+    )
+    
+    fig.update_layout(
+        height=350,
+        legend=dict(orientation="h", yanchor="bottom", y=-0.3, xanchor="center", x=0.5),
+        margin=dict(t=20, b=20),
+        xaxis_tickangle=-45,
+    )
+    return fig
+
+
+def render_progress_chart(period, period_label):
+    """Render progress distribution (pie chart); period = (data_version, start, end)"""
+    st.subheader("📊 Progress Distribution")
+    st.caption(f"Period: {period_label}")
+    
+    fig = build_progress_fig(*period)
+    if fig is None:
+        st.info("No data for this period")
+        return
     
     st.plotly_chart(fig, use_container_width=True)
 
 
-def render_trend_chart(df_all):
+def render_channel_chart(period, period_label):
+    """Render channel distribution (bar chart)"""
+    st.subheader("📊 Issues by Channel")
+    st.caption(f"Period: {period_label} (Top 10)")
+    
+    fig = build_channel_fig(*period)
+    if fig is None:
+        st.info("No channel data for this period")
+        return
+    
+    st.plotly_chart(fig, use_container_width=True)
+
+
+def render_trend_chart(data_version):
     """Render issue trend over time (line chart) with independent time selector"""
     st.subheader("📈 Issue Trend Over Time")
     
@@ -339,152 +498,57 @@ def render_trend_chart(df_all):
             if isinstance(custom_dates, tuple) and len(custom_dates) == 2:
                 custom_start, custom_end = custom_dates
     
-    df = df_all.copy()
-    df["parsed_date"] = df["date"].apply(parse_date)
-    df_valid = df[df["parsed_date"].notna()].copy()
-    
-    if df_valid.empty:
-        st.info("No valid date data for trend chart")
-        return
-    
-    df_valid["date_only"] = df_valid["parsed_date"].dt.date
-    
-    # Filter by selected time range
+    # Resolve the selected range to (start, end); None = open bound
     today = date.today()
+    start_date = end_date = None
     if trend_range == "7 days":
         start_date = today - timedelta(days=7)
-        df_valid = df_valid[df_valid["date_only"] >= start_date]
     elif trend_range == "30 days":
         start_date = today - timedelta(days=30)
-        df_valid = df_valid[df_valid["date_only"] >= start_date]
     elif trend_range == "90 days":
         start_date = today - timedelta(days=90)
-        df_valid = df_valid[df_valid["date_only"] >= start_date]
     elif trend_range == "Custom" and custom_start and custom_end:
-        df_valid = df_valid[(df_valid["date_only"] >= custom_start) & (df_valid["date_only"] <= custom_end)]
+        start_date, end_date = custom_start, custom_end
     # "All time" - no filter
     
-    if df_valid.empty:
-        st.info(f"No data for the selected time range ({trend_range})")
+    if daily_counts_series(data_version).empty:
+        st.info("No valid date data for trend chart")
         return
     
-    daily_counts = df_valid.groupby("date_only").size().reset_index(name="count")
-    daily_counts = daily_counts.sort_values("date_only")
+    fig, caption = build_trend_fig(data_version, start_date, end_date)
+    if fig is None:
+        st.info(f"No data for the selected time range ({trend_range})")
+        return
     
     # Show date range info
-    if not daily_counts.empty:
-        date_min = daily_counts["date_only"].min()
-        date_max = daily_counts["date_only"].max()
-        st.caption(f"Showing: {date_min.strftime('%b %d, %Y')} - {date_max.strftime('%b %d, %Y')} ({len(daily_counts)} days with data)")
-    
-    fig = px.line(
-        daily_counts,
-        x="date_only",
-        y="count",
-        markers=True,
-        labels={"date_only": "Date", "count": "Number of Issues"},
-    )
-    
-    fig.update_layout(
-        xaxis_title="Date",
-        yaxis_title="Issues",
-        hovermode="x unified",
-        height=350,
-        margin=dict(t=20, b=20),
-    )
-    
-    fig.update_traces(
-        line_color="#667eea",
-        marker_color="#667eea",
-        line_width=2,
-        marker_size=8,
-    )
+    st.caption(caption)
     
     st.plotly_chart(fig, use_container_width=True)
 
 
-def render_problem_category_chart(df, period_label):
+def render_problem_category_chart(period, period_label):
     """Render problem category distribution (pie chart) - Problem Type"""
     st.subheader("🏷️ Problem Type Distribution")
     st.caption(f"Period: {period_label}")
     
-    if "problem_category" not in df.columns:
-        st.info("Problem Category data not available")
-        return
-    
-    # Filter out empty values
-    df_valid = df[df["problem_category"].notna() & (df["problem_category"] != "")].copy()
-    
-    if df_valid.empty:
+    fig = build_problem_category_fig(*period)
+    if fig is None:
         st.info("No Problem Category data for this period")
         return
     
-    problem_counts = df_valid["problem_category"].value_counts().reset_index()
-    problem_counts.columns = ["Problem Type", "Count"]
-    
-    # Get colors
-    colors = [PROBLEM_CATEGORY_COLORS.get(p, "#6b7280") for p in problem_counts["Problem Type"]]
-    
-    fig = go.Figure(data=[go.Pie(
-        labels=problem_counts["Problem Type"],
-        values=problem_counts["Count"],
-        marker_colors=colors,
-        hole=0.4,
-        textinfo="label+percent",
-        textposition="outside",
-    )])
-    
-    fig.update_layout(
-        height=350,
-        showlegend=True,
-        legend=dict(orientation="h", yanchor="bottom", y=-0.2, xanchor="center", x=0.5),
-        margin=dict(t=20, b=20),
-    )
-    
     st.plotly_chart(fig, use_container_width=True)
 
 
-def render_problem_category_progress_chart(df, period_label):
+def render_problem_category_progress_chart(period, period_label):
     """Render problem category by progress (stacked bar chart)"""
     st.subheader("📊 Problem Type by Status")
     st.caption(f"Period: {period_label}")
     
-    if "problem_category" not in df.columns:
-        st.info("Problem Category data not available")
-        return
-    
-    df_valid = df[df["problem_category"].notna() & (df["problem_category"] != "")].copy()
-    
-    if df_valid.empty:
+    fig = build_problem_category_progress_fig(*period)
+    if fig is None:
         st.info("No Problem Category data for this period")
         return
     
-    df_valid["normalized_progress"] = df_valid["progress"].apply(normalize_progress)
-    
-    # Group by problem_category and progress
-    grouped = df_valid.groupby(["problem_category", "normalized_progress"]).size().reset_index(name="count")
-    
-    fig = px.bar(
-        grouped,
-        x="problem_category",
-        y="count",
-        color="normalized_progress",
-        color_discrete_map=PROGRESS_COLORS,
-        barmode="stack",
-        labels={
-            "problem_category": "Problem Type",
-            "count": "Number of Issues",
-            "normalized_progress": "Status"
-        }
-    )
-    
-    fig.update_layout(
-        height=350,
-        legend=dict(orientation="h", yanchor="bottom", y=-0.3, xanchor="center", x=0.5),
-        margin=dict(t=20, b=20),
-        xaxis_tickangle=-45,
-    )
-    
     st.plotly_chart(fig, use_container_width=True)
 
 
@@ -497,24 +561,24 @@ def main():
     st.markdown("Data analysis with time range comparison")
     st.markdown("---")
     
-    # Load all data
-    issues = get_all_issues()
+    # Load all data (cached until the database changes)
+    data_version = get_data_version()
+    df_all = load_issues_df(data_version)
     
-    if not issues:
+    if df_all.empty:
         st.warning("⚠️ No data available. Run sync script first.")
         return
     
-    df_all = pd.DataFrame(issues)
-    
     # Time range selector
     mode, custom_start, custom_end = render_time_selector()
     
     # Get period ranges
-    current_start, current_end, prev_start, prev_end, period_label, compare_label = get_period_range(mode, custom_start, custom_end)
+    periods = get_period_range(mode, custom_start, custom_end)
+    period_label = periods.period_label
     
     # Filter data by periods
-    df_current = filter_by_date_range(df_all, current_start, current_end)
-    df_prev = filter_by_date_range(df_all, prev_start, prev_end)
+    df_current = filter_by_date_range(df_all, periods.current_start, periods.current_end)
+    df_prev = filter_by_date_range(df_all, periods.prev_start, periods.prev_end)
     
     # Calculate stats
     current_stats = calculate_stats(df_current)
@@ -523,18 +587,21 @@ def main():
     st.markdown("---")
     
     # Comparison metrics
-    render_comparison_metrics(current_stats, prev_stats, period_label, compare_label)
+    render_comparison_metrics(current_stats, prev_stats, period_label, periods.compare_label)
     
     st.markdown("---")
     
+    # Charts are cached per (data_version, start, end)
+    period = (data_version, periods.current_start, periods.current_end)
+    
     # Charts - Row 1: Progress & Channel
     col1, col2 = st.columns(2)
     
     with col1:
-        render_progress_chart(df_current, period_label)
+        render_progress_chart(period, period_label)
     
     with col2:
-        render_channel_chart(df_current, period_label)
+        render_channel_chart(period, period_label)
     
     st.markdown("---")
     
@@ -542,15 +609,15 @@ def main():
     col1, col2 = st.columns(2)
     
     with col1:
-        render_problem_category_chart(df_current, period_label)
+        render_problem_category_chart(period, period_label)
     
     with col2:
-        render_problem_category_progress_chart(df_current, period_label)
+        render_problem_category_progress_chart(period, period_label)
     
     st.markdown("---")
     
     # Trend chart (independent time selector)
-    render_trend_chart(df_all)
+    render_trend_chart(data_version)
 
 
 if __name__ == "__main__":
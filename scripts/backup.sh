@@ -28,7 +28,21 @@ mkdir -p "$BACKUP_DIR"
 TIMESTAMP=$(date +%Y%m%d_%H%M%S)
 BACKUP_FILE="$BACKUP_DIR/issues_${TIMESTAMP}.db"
 
-cp "$DB_PATH" "$BACKUP_FILE"
+# Online backup via SQLite's backup API (consistent snapshot incl. pages still
+# in the WAL file; a plain cp of the main file can be stale or torn in WAL mode).
+# The image has no sqlite3 CLI, so use Python's sqlite3 module.
+python3 - "$DB_PATH" "$BACKUP_FILE" <<'PY'
+import sqlite3
+import sys
+
+src = sqlite3.connect(sys.argv[1])
+dst = sqlite3.connect(sys.argv[2])
+try:
+    src.backup(dst)
+finally:
+    dst.close()
+    src.close()
+PY
 echo "Backup created: $BACKUP_FILE ($(du -h "$BACKUP_FILE" | cut -f1))"
 
 # Clean old backups
@@ -16,8 +16,15 @@ PROJECT_ROOT = Path(__file__).parent.parent
 sys.path.insert(0, str(PROJECT_ROOT))
 
 import time
+from functools import lru_cache
+
 import gspread
+import pandas as pd
+from google.auth.transport.requests import AuthorizedSession
 from google.oauth2.service_account import Credentials
+from gspread.utils import ValueRenderOption, DateTimeOption
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
 
 from config import (
     CREDENTIALS_PATH, SPREADSHEET_ID, SHEET_NAME, 
@@ -27,14 +34,30 @@ from utils.db import (
     init_database, safe_replace_issues,
     log_sync, get_issues_count, get_last_sync
 )
+from utils.common import parse_date_series, normalize_progress_series
 from utils.logger import setup_logger
 
 logger = setup_logger("sync")
 
+# Google Sheets 日期序列号的起点 (serial 0 = 1899-12-30)
+SHEETS_EPOCH = "1899-12-30"
+# 当作日期序列号转换的数值范围 (1899-12-31 .. 9999-12-31，即 Sheets 支持的日期上限)
+# 范围外的数字 (误输入的大数、负数、inf) 原样保留为文本，不能中断整次同步
+SERIAL_DATE_RANGE = (1, 2958465)
+
 # ============== Retry Mechanism ==============
 MAX_RETRIES = 3
 BASE_DELAY = 2  # seconds
 
+# HTTP 层重试: 429/5xx 在同一个 session (连接池) 内重试单个请求
+HTTP_RETRY = Retry(
+    total=3,
+    backoff_factor=1,
+    status_forcelist=[429, 500, 502, 503, 504],
+    raise_on_status=False,  # 重试用尽后返回响应，由 gspread 抛出 APIError
+)
+REQUEST_TIMEOUT = (10, 60)  # (connect, read) seconds
+
 
 def retry_on_error(func, description="operation"):
     """
@@ -53,52 +76,106 @@ def retry_on_error(func, description="operation"):
             time.sleep(delay)
 
 
+@lru_cache(maxsize=1)
+def _authorize():
+    """
+    gspread client (缓存): 认证和 HTTP session 只建立一次，
+    重试和后续同步复用同一个连接池
+    """
+    credentials = get_google_credentials()
+    session = AuthorizedSession(credentials)
+    session.mount("https://", HTTPAdapter(max_retries=HTTP_RETRY))
+    gc = gspread.authorize(credentials, session=session)
+    gc.set_timeout(REQUEST_TIMEOUT)
+    return gc
+
+
 def fetch_google_sheets_data():
     """从 Google Sheets 获取数据 (with retry)"""
     logger.info("[1/3] Connecting to Google Sheets...")
+    gc = _authorize()
     
-    def _connect_and_fetch():
-        credentials = get_google_credentials()
-        gc = gspread.authorize(credentials)
-        
+    def _open_worksheet():
         spreadsheet = gc.open_by_key(SPREADSHEET_ID)
         logger.info(f"  Spreadsheet: {spreadsheet.title}")
         
         worksheet = spreadsheet.worksheet(SHEET_NAME)
         logger.info(f"  Worksheet: {worksheet.title}")
-        
-        logger.info("[2/3] Fetching data...")
-        raw_data = worksheet.get_all_records()
-        logger.info(f"  Raw rows: {len(raw_data)}")
-        return raw_data
+        return worksheet
+    
+    # 每一步单独重试: 读取失败时不重新认证、重新打开表格
+    worksheet = retry_on_error(_open_worksheet, "Google Sheets connect")
     
-    return retry_on_error(_connect_and_fetch, "Google Sheets fetch")
+    logger.info("[2/3] Fetching data...")
+    
+    def _fetch():
+        # get_all_values: 原始二维列表，直接建 DataFrame (不经过 get_all_records 的逐行 dict)
+        # UNFORMATTED_VALUE + SERIAL_NUMBER: 返回数字/日期序列号而不是显示字符串
+        return worksheet.get_all_values(
+            value_render_option=ValueRenderOption.unformatted,
+            date_time_render_option=DateTimeOption.serial_number,
+        )
+    
+    values = retry_on_error(_fetch, "Google Sheets fetch")
+    if not values:
+        raw_df = pd.DataFrame()
+    else:
+        header, rows = values[0], values[1:]
+        raw_df = pd.DataFrame(rows, columns=header)
+    logger.info(f"  Raw rows: {len(raw_df)}")
+    return raw_df
 
 
-def transform_data(raw_data):
-    """转换数据格式（列名映射），跳过无效行"""
-    transformed = []
-    skipped = 0
+def _strip_strings(series):
+    """去掉字符串值首尾空白；非字符串值 (数字等) 原样保留"""
+    if series.dtype != object and not isinstance(series.dtype, pd.StringDtype):
+        return series
+    try:
+        stripped = series.str.strip()
+    except AttributeError:
+        return series  # object 列里全是数字 (没有字符串)
+    # .str 对非字符串元素返回 NaN，这些位置用原值回填
+    return stripped.where(stripped.notna(), series)
+
+
+def serial_dates_to_text(series):
+    """
+    把 Sheets 日期序列号转换为 "MM/DD/YYYY" 字符串 (向量化)
+    非数字的值 (手工输入的文本日期、空值) 和 SERIAL_DATE_RANGE 之外的数字原样保留
+    """
+    serials = pd.to_numeric(series, errors="coerce")
+    serials = serials.where(serials.between(*SERIAL_DATE_RANGE))
+    dates = pd.to_datetime(serials, unit="D", origin=SHEETS_EPOCH, errors="coerce")
+    return series.where(dates.isna(), dates.dt.strftime("%m/%d/%Y"))
+
+
+def transform_data(raw_df):
+    """
+    转换数据格式（列名映射），跳过无效行
     
-    for row in raw_data:
-        # 跳过 ID 为空的行（上游数据录入遗漏）
-        raw_id = row.get("ID", "")
-        if raw_id == "" or raw_id is None:
-            skipped += 1
-            continue
-        
-        item = {}
-        for sheet_col, db_col in COLUMN_MAPPING.items():
-            value = row.get(sheet_col, "")
-            if isinstance(value, str):
-                value = value.strip()
-            item[db_col] = value
-        transformed.append(item)
+    raw_df: 以表头为列名的 DataFrame (list of dicts 也可以)
+    Returns: list of dicts (db 列名)
+    """
+    raw_df = pd.DataFrame(raw_df)
+    # 缺失的列按空字符串处理
+    df = raw_df.reindex(columns=list(COLUMN_MAPPING), fill_value="")
+    
+    # 跳过 ID 为空的行（上游数据录入遗漏）
+    df = df[df["ID"].notna() & (df["ID"] != "")]
+    skipped = len(raw_df) - len(df)
+    
+    df = df.rename(columns=COLUMN_MAPPING).apply(_strip_strings)
+    df["date"] = serial_dates_to_text(df["date"])
+    
+    # 派生列整列向量化计算 (db 层直接使用，不再逐行 normalize_progress / parse_date)
+    df["progress_norm"] = normalize_progress_series(df["progress"])
+    parsed = parse_date_series(df["date"])
+    df["parsed_date"] = parsed.dt.strftime("%Y-%m-%d").astype(object).where(parsed.notna(), None)
     
     if skipped > 0:
         logger.warning(f"  Skipped {skipped} rows with empty ID")
     
-    return transformed
+    return df.to_dict("records")
 
 
 def sync():
@@ -113,10 +190,10 @@ def sync():
         init_database()
         
         # 获取数据
-        raw_data = fetch_google_sheets_data()
+        raw_df = fetch_google_sheets_data()
         
         # 转换格式
-        data = transform_data(raw_data)
+        data = transform_data(raw_df)
         
         # 全量同步：事务保护（清空 + 插入在同一事务内）
         logger.info("[3/3] Writing to database...")
@@ -0,0 +1,105 @@
+"""
+Tests for utils/auth.py - cached auth configuration
+"""
+import sys
+import os
+import subprocess
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from utils.auth import _is_auth_required, _get_password, reset_auth_cache
+
+
+def test_auth_config_cached():
+    """Test env lookups are cached until reset_auth_cache()"""
+    os.environ["REQUIRE_AUTH"] = "true"
+    os.environ["DASHBOARD_PASSWORD"] = "secret"
+    reset_auth_cache()
+    
+    try:
+        assert _is_auth_required() is True
+        assert _get_password() == "secret"
+        
+        # Cached: env changes are not seen until the cache is reset
+        os.environ["REQUIRE_AUTH"] = "false"
+        assert _is_auth_required() is True
+        
+        reset_auth_cache()
+        assert _is_auth_required() is False
+    finally:
+        del os.environ["REQUIRE_AUTH"]
+        del os.environ["DASHBOARD_PASSWORD"]
+        reset_auth_cache()
+    
+    # No env and no secrets: auth off
+    assert _is_auth_required() is False
+    assert _get_password() == ""
+    
+    print("✅ test_auth_config_cached passed")
+
+
+def test_auth_import_is_lazy():
+    """Test importing auth (and reading env config) does not load Streamlit"""
+    code = (
+        "import sys, utils.auth as auth; "
+        "assert auth._is_auth_required() is False; "
+        "print('streamlit' in sys.modules)"
+    )
+    env = {**os.environ, "REQUIRE_AUTH": "false"}
+    out = subprocess.run(
+        [sys.executable, "-c", code],
+        cwd=Path(__file__).parent.parent, env=env,
+        capture_output=True, text=True, check=True,
+    ).stdout.strip()
+    assert out == "False"
+    
+    print("✅ test_auth_import_is_lazy passed")
+
+
+class _FlakySecrets:
+    """st.secrets stand-in whose first read fails (e.g. secrets not loaded yet)"""
+    
+    def __init__(self, data):
+        self.data = data
+        self.reads = 0
+    
+    def __contains__(self, key):
+        self.reads += 1
+        if self.reads == 1:
+            raise RuntimeError("secrets unavailable")
+        return key in self.data
+    
+    def __getitem__(self, key):
+        return self.data[key]
+
+
+def test_secrets_read_not_cached():
+    """Test a failed secrets read doesn't leave auth disabled for the process"""
+    import streamlit as st
+    
+    original = st.secrets
+    st.secrets = _FlakySecrets({"password": "s3cret"})
+    reset_auth_cache()
+    try:
+        # First read fails: no password, auth off for this run
+        assert _is_auth_required() is False
+        # Next rerun reads the secrets successfully: auth kicks in
+        assert _is_auth_required() is True
+        assert _get_password() == "s3cret"
+        
+        # Password added / rotated while the process runs
+        st.secrets.data["password"] = "rotated"
+        assert _get_password() == "rotated"
+    finally:
+        st.secrets = original
+        reset_auth_cache()
+    
+    print("✅ test_secrets_read_not_cached passed")
+
+
+if __name__ == "__main__":
+    test_auth_config_cached()
+    test_auth_import_is_lazy()
+    test_secrets_read_not_cached()
+    print("\n✅ All auth tests passed")
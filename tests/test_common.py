@@ -6,7 +6,16 @@ from pathlib import Path
 
 sys.path.insert(0, str(Path(__file__).parent.parent))
 
-from utils.common import normalize_progress, parse_date, PROGRESS_COLORS, PROGRESS_VALUES
+from datetime import date
+
+import numpy as np
+import pandas as pd
+
+from utils.common import (
+    normalize_progress, normalize_progress_series, parse_date, parse_date_series,
+    get_period_range, PeriodRange, lttb_indices,
+    PROGRESS_COLORS, PROGRESS_VALUES,
+)
 
 
 def test_normalize_progress():
@@ -23,6 +32,8 @@ def test_normalize_progress():
     assert normalize_progress("in progress") == "In Progress"
     assert normalize_progress("pending") == "Pending"
     assert normalize_progress("block") == "Blocked"
+    assert normalize_progress("dOne") == "Done"
+    assert normalize_progress("In PROGRESS") == "In Progress"
     
     # Edge cases
     assert normalize_progress(None) == "Unknown"
@@ -35,6 +46,17 @@ def test_normalize_progress():
     print("✅ test_normalize_progress passed")
 
 
+def test_normalize_progress_series():
+    """Test vectorized progress normalization matches the scalar version"""
+    raw = pd.Series(["Done", "done ", "In progress", "PENDING", None, "", "Block", "xyz"])
+    result = normalize_progress_series(raw)
+    
+    assert list(result) == [normalize_progress(v) for v in raw]
+    assert list(result.index) == list(raw.index)
+    
+    print("✅ test_normalize_progress_series passed")
+
+
 def test_parse_date():
     """Test date parsing with multiple formats"""
     # US format (Google Sheets default)
@@ -61,6 +83,68 @@ def test_parse_date():
     print("✅ test_parse_date passed")
 
 
+def test_parse_date_series():
+    """Test vectorized date parsing matches the scalar version"""
+    raw = pd.Series(["01/23/2026", " 2026-01-23 ", "01/23/26", "23/01/2026",
+                     "bad", "", None, "2/30/2026"])
+    result = parse_date_series(raw)
+    for value, parsed in zip(raw, result):
+        expected = parse_date(value)
+        if expected is None:
+            assert pd.isna(parsed), value
+        else:
+            assert parsed == expected, value
+    
+    print("✅ test_parse_date_series passed")
+
+
+def test_get_period_range():
+    """Test period / comparison ranges for each mode"""
+    today = date(2026, 3, 4)  # Wednesday
+    
+    day = get_period_range("Day", today=today)
+    assert isinstance(day, PeriodRange)
+    assert (day.current_start, day.current_end) == (today, today)
+    assert (day.prev_start, day.prev_end) == (date(2026, 3, 3), date(2026, 3, 3))
+    
+    week = get_period_range("Week", today=today)
+    assert (week.current_start, week.current_end) == (date(2026, 3, 2), today)
+    assert (week.prev_start, week.prev_end) == (date(2026, 2, 23), date(2026, 3, 1))
+    
+    month = get_period_range("Month", today=today)
+    assert (month.current_start, month.prev_start, month.prev_end) == (
+        date(2026, 3, 1), date(2026, 2, 1), date(2026, 2, 28))
+    assert month.period_label == "Mar 2026"
+    
+    # Custom: 前一个同等长度周期
+    custom = get_period_range("Custom", date(2026, 2, 10), date(2026, 2, 16), today=today)
+    assert (custom.prev_start, custom.prev_end) == (date(2026, 2, 3), date(2026, 2, 9))
+    assert custom.period_label.endswith("(7 days)")
+    
+    # Cached: same key returns the same (frozen) object
+    assert get_period_range("Week", today=today) is week
+    
+    print("✅ test_get_period_range passed")
+
+
+def test_lttb_indices():
+    """Test LTTB downsampling keeps endpoints, order and spikes"""
+    x = np.arange(5000)
+    y = np.zeros(5000)
+    y[2500] = 10  # a single spike must survive downsampling
+    
+    idx = lttb_indices(x, y, 500)
+    assert len(idx) == 500
+    assert idx[0] == 0 and idx[-1] == 4999
+    assert (np.diff(idx) > 0).all()
+    assert 2500 in idx
+    
+    # Nothing to downsample
+    assert list(lttb_indices(x[:10], y[:10], 20)) == list(range(10))
+    
+    print("✅ test_lttb_indices passed")
+
+
 def test_color_constants():
     """Verify all progress values have associated colors"""
     for val in PROGRESS_VALUES:
@@ -72,6 +156,10 @@ def test_color_constants():
 
 if __name__ == "__main__":
     test_normalize_progress()
+    test_normalize_progress_series()
     test_parse_date()
+    test_parse_date_series()
+    test_get_period_range()
+    test_lttb_indices()
     test_color_constants()
     print("\n✅ All common tests passed")
@@ -13,7 +13,8 @@ def test_config_loads():
     from config import (
         PROJECT_ROOT, DATA_DIR, LOGS_DIR, DATABASE_PATH,
         CREDENTIALS_PATH, SPREADSHEET_ID, SHEET_NAME, SCOPES,
-        COLUMN_MAPPING, CORE_FIELDS, ALL_FIELDS, DISPLAY_NAMES
+        COLUMN_MAPPING, CORE_FIELDS, ALL_FIELDS, DISPLAY_NAMES,
+        REVERSE_COLUMN_MAPPING,
     )
     
     assert PROJECT_ROOT.exists()
@@ -24,6 +25,8 @@ def test_config_loads():
     assert "id" in ALL_FIELDS
     assert "progress" in ALL_FIELDS
     assert "problem_category" in ALL_FIELDS
+    assert REVERSE_COLUMN_MAPPING["progress"] == "Progress"
+    assert len(REVERSE_COLUMN_MAPPING) == len(COLUMN_MAPPING)
     
     print("✅ test_config_loads passed")
 
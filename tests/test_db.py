@@ -3,6 +3,7 @@ Tests for utils/db.py - database operations
 """
 import sys
 import os
+import sqlite3
 import tempfile
 from pathlib import Path
 
@@ -19,9 +20,11 @@ import config
 importlib.reload(config)
 
 from utils.db import (
-    init_database, insert_issues, get_all_issues,
-    get_issues_count, safe_replace_issues, get_statistics,
-    search_issues, log_sync, get_last_sync
+    init_database, insert_issues, get_all_issues, get_all_issues_df, iter_all_issues,
+    get_issues_count, safe_replace_issues, get_statistics, get_dashboard_stats,
+    search_issues, filter_issues, filter_issue_rows, filter_issues_df, search_issues_df, ISSUE_COLUMNS, log_sync, get_last_sync, get_db_mtime,
+    get_connection, get_unique_values, SCHEMA_VERSION,
+    get_data_version, get_last_sync_cached, clear_issues,
 )
 
 
@@ -54,6 +57,13 @@ def test_init_database():
     """Test database initialization"""
     init_database()
     assert get_issues_count() == 0
+    
+    # Schema version is recorded; a second init skips the migrations
+    with get_connection() as conn:
+        assert conn.execute("PRAGMA user_version").fetchone()[0] == SCHEMA_VERSION
+    init_database()
+    assert get_issues_count() == 0
+    
     print("✅ test_init_database passed")
 
 
@@ -65,6 +75,15 @@ def test_insert_and_query():
     
     all_issues = get_all_issues()
     assert len(all_issues) == 3
+    assert [r["id"] for r in all_issues] == [3, 2, 1]
+    assert list(all_issues[0]) == ISSUE_COLUMNS
+    
+    # Streaming in small batches yields the same rows in the same order
+    assert list(iter_all_issues(batch=2)) == all_issues
+    
+    df = get_all_issues_df()
+    assert list(df.columns) == ISSUE_COLUMNS
+    assert df.to_dict("records") == all_issues
     
     print("✅ test_insert_and_query passed")
 
@@ -76,6 +95,16 @@ def test_safe_replace():
     assert count == 2
     assert get_issues_count() == 2
     
+    # A failing insert rolls back the DELETE as well
+    bad = [SAMPLE_ISSUES[0], {"id": "not-an-int"}]
+    try:
+        safe_replace_issues(bad)
+        raised = False
+    except sqlite3.Error:
+        raised = True
+    assert raised
+    assert get_issues_count() == 2
+    
     print("✅ test_safe_replace passed")
 
 
@@ -90,9 +119,96 @@ def test_search():
     results = search_issues("nonexistent_keyword_xyz")
     assert len(results) == 0
     
+    # Full-text index keeps LIKE semantics: case-insensitive substring match
+    assert {r["id"] for r in search_issues("issue 2")} == {2}
+    assert {r["id"] for r in search_issues("ALIC")} == {1, 3}
+    assert search_issues('say "hi"') == []
+    # Keywords shorter than a trigram fall back to LIKE
+    assert {r["id"] for r in search_issues("Bo")} == {2}
+    
+    # Appends update only their own ids in the index (no full rebuild),
+    # including replacements of existing rows and text ids
+    with get_connection() as conn:
+        statements = []
+        conn.set_trace_callback(statements.append)
+        try:
+            insert_issues([
+                {**SAMPLE_ISSUES[1], "issue": "Renamed entry"},
+                {**SAMPLE_ISSUES[0], "id": "7", "issue": "Seventh entry"},
+            ])
+        finally:
+            conn.set_trace_callback(None)
+    assert not any("rebuild" in sql for sql in statements)
+    assert search_issues("issue 2") == []
+    assert {r["id"] for r in search_issues("renamed")} == {2}
+    assert {r["id"] for r in search_issues("seventh")} == {7}
+    assert {r["id"] for r in search_issues("test issue")} == {1, 3}
+    with get_connection() as conn:
+        # Raises if the external-content index disagrees with the issues table
+        conn.execute("INSERT INTO issues_fts(issues_fts, rank) VALUES('integrity-check', 1)")
+        conn.commit()
+    
     print("✅ test_search passed")
 
 
+def test_filter():
+    """Test SQL-side filters (normalized progress, problem category, keyword)"""
+    safe_replace_issues(SAMPLE_ISSUES + [
+        {"id": 4, "date": "01/26/2026", "channel": "rocm", "category": "Other",
+         "issue": "Test issue 4", "owner": "Bob", "progress": "done",
+         "problem_category": "Library/Build"},
+    ])
+    
+    done = filter_issues(progress="Done")
+    assert sorted(r["id"] for r in done) == [1, 4]
+    
+    results = filter_issues(progress="Done", problem_category="Setup/Drivers")
+    assert [r["id"] for r in results] == [1]
+    
+    results = filter_issues(keyword="rocm", problem_category="Library/Build")
+    assert [r["id"] for r in results] == [4]
+    
+    assert len(filter_issues()) == 4
+    assert {r["progress_norm"] for r in done} == {"Done"}
+    
+    rows = filter_issue_rows(progress="Done")
+    assert [dict(zip(ISSUE_COLUMNS, row)) for row in rows] == [
+        {col: r[col] for col in ISSUE_COLUMNS} for r in done
+    ]
+    
+    df = filter_issues_df(progress="Done")
+    assert list(df.columns) == ISSUE_COLUMNS
+    assert df.to_dict("records") == done
+    assert search_issues_df("rocm")["id"].tolist() == [r["id"] for r in search_issues("rocm")]
+    
+    # Dates compare on the ISO parsed_date written at sync time (12/31/2025 < 01/24/2026)
+    safe_replace_issues(SAMPLE_ISSUES + [
+        {"id": 5, "date": "12/31/2025", "progress": "Done"},
+        {"id": 6, "date": "bad date", "progress": "Done"},
+    ])
+    assert {r["id"]: r["parsed_date"] for r in filter_issues(progress="Done")} == {
+        1: "2026-01-23", 5: "2025-12-31", 6: None,
+    }
+    results = filter_issues(date_from="01/24/2026", date_to="01/25/2026")
+    assert sorted(r["id"] for r in results) == [2, 3]
+    results = filter_issues(date_to="01/23/2026")
+    assert sorted(r["id"] for r in results) == [1, 5]
+    
+    # Column names are whitelisted before being interpolated into SQL
+    assert get_unique_values("owner") == ["Alice", "Bob"]
+    # Cached per data version: a write is picked up on the next call
+    insert_issues([{**SAMPLE_ISSUES[0], "id": 9, "owner": "Carol"}])
+    assert get_unique_values("owner") == ["Alice", "Bob", "Carol"]
+    try:
+        get_unique_values("owner; DROP TABLE issues")
+        raised = False
+    except ValueError:
+        raised = True
+    assert raised
+    
+    print("✅ test_filter passed")
+
+
 def test_statistics():
     """Test statistics computation"""
     safe_replace_issues(SAMPLE_ISSUES)
@@ -101,6 +217,14 @@ def test_statistics():
     assert stats["total"] == 3
     assert "by_progress" in stats
     assert "by_problem_category" in stats
+    assert stats["by_progress"] == {"Done": 1, "In Progress": 1, "Pending": 1}
+    assert sum(stats["by_owner"].values()) == stats["total"]
+    assert sum(stats["by_category"].values()) == stats["total"]
+    
+    dash = get_dashboard_stats()
+    assert dash.total == stats["total"]
+    assert dash.by_progress == stats["by_progress"]
+    assert dash.by_problem_category == stats["by_problem_category"]
     
     print("✅ test_statistics passed")
 
@@ -116,6 +240,66 @@ def test_sync_log():
     print("✅ test_sync_log passed")
 
 
+def test_data_version_cache():
+    """Test data-version caches are invalidated by writes"""
+    safe_replace_issues(SAMPLE_ISSUES)
+    log_sync(3, "success", "first")
+    version = get_data_version()
+    assert get_last_sync_cached()["message"] == "first"
+    
+    # Unchanged version: served from cache
+    assert get_data_version() == version
+    
+    safe_replace_issues(SAMPLE_ISSUES[:1])
+    log_sync(1, "success", "second")
+    assert get_data_version()[0] > version[0]
+    assert get_last_sync_cached()["message"] == "second"
+    
+    # clear_issues is a writer too: bumps the version and empties the search index
+    version = get_data_version()
+    clear_issues()
+    assert get_data_version()[0] > version[0]
+    assert get_issues_count() == 0
+    assert get_unique_values("owner") == []
+    with get_connection() as conn:
+        # Raises if the external-content index still holds the deleted rows
+        conn.execute("INSERT INTO issues_fts(issues_fts, rank) VALUES('integrity-check', 1)")
+        conn.commit()
+    
+    print("✅ test_data_version_cache passed")
+
+
+def test_db_mtime():
+    """Test database mtime changes after a write (used as cache key)"""
+    before = get_db_mtime()
+    assert before > 0
+    
+    os.utime(_temp_db.name, (before - 10, before - 10))
+    safe_replace_issues(SAMPLE_ISSUES)
+    assert get_db_mtime() > before - 10
+    
+    print("✅ test_db_mtime passed")
+
+
+def test_connection_reuse():
+    """Test the per-thread connection is reused and survives a failed write"""
+    with get_connection() as first:
+        pass
+    with get_connection() as second:
+        assert second is first
+    
+    # An error inside the block rolls back; the connection stays usable
+    try:
+        with get_connection() as conn:
+            conn.execute("DELETE FROM issues")
+            raise RuntimeError("boom")
+    except RuntimeError:
+        pass
+    assert get_issues_count() == 3
+    
+    print("✅ test_connection_reuse passed")
+
+
 def cleanup():
     """Remove temp database"""
     try:
@@ -130,8 +314,12 @@ if __name__ == "__main__":
         test_insert_and_query()
         test_safe_replace()
         test_search()
+        test_filter()
         test_statistics()
         test_sync_log()
+        test_db_mtime()
+        test_connection_reuse()
+        test_data_version_cache()
         print("\n✅ All DB tests passed")
     finally:
         cleanup()
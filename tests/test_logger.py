@@ -0,0 +1,38 @@
+"""
+Tests for utils/logger.py - lazy file handler
+"""
+import sys
+import tempfile
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from utils.logger import setup_logger
+
+
+def test_file_handler_is_lazy():
+    """Test the log directory/file are only created by the first record"""
+    with tempfile.TemporaryDirectory() as tmp:
+        log_dir = Path(tmp) / "logs"
+        logger = setup_logger("test_lazy_logger", log_dir=log_dir)
+        try:
+            assert not log_dir.exists()
+            
+            logger.info("first record")
+            log_file = log_dir / "app.log"
+            assert log_file.exists()
+            
+            for handler in logger.handlers:
+                handler.flush()
+            assert "test_lazy_logger: first record" in log_file.read_text(encoding="utf-8")
+        finally:
+            for handler in list(logger.handlers):
+                handler.close()
+                logger.removeHandler(handler)
+    
+    print("✅ test_file_handler_is_lazy passed")
+
+
+if __name__ == "__main__":
+    test_file_handler_is_lazy()
+    print("\n✅ All logger tests passed")
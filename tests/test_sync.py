@@ -0,0 +1,101 @@
+"""
+Tests for scripts/sync_google_sheets.py - vectorized transform helpers
+"""
+import sys
+from datetime import date
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+import numpy as np
+import pandas as pd
+
+from config import COLUMN_MAPPING
+from scripts.sync_google_sheets import serial_dates_to_text, _strip_strings, transform_data
+
+
+def _serial(d):
+    """Sheets serial number of a date (serial 0 = 1899-12-30)"""
+    return (d - date(1899, 12, 30)).days
+
+
+def test_serial_dates_to_text():
+    """Test serial numbers convert; text, blanks and out-of-range numbers pass through"""
+    jan23 = _serial(date(2026, 1, 23))
+    series = pd.Series(
+        [jan23, jan23 + 0.75, "01/24/2026", "", None, np.nan, 1e12, -5, np.inf, "abc"],
+        dtype=object,
+    )
+    result = serial_dates_to_text(series).tolist()
+    
+    assert result[:4] == ["01/23/2026", "01/23/2026", "01/24/2026", ""]
+    assert result[4] is None
+    assert pd.isna(result[5])
+    # Out of range / non-finite numbers are kept as-is instead of aborting the sync
+    assert result[6:9] == [1e12, -5, np.inf]
+    assert result[9] == "abc"
+    
+    # Upper bound of the accepted range (Sheets' max date)
+    assert serial_dates_to_text(pd.Series([_serial(date(9999, 12, 31))])).tolist() == ["12/31/9999"]
+    
+    print("✅ test_serial_dates_to_text passed")
+
+
+def test_strip_strings():
+    """Test whitespace is stripped from strings only; other values are untouched"""
+    mixed = pd.Series(["  a ", 5, None, np.nan, "b\n", ""], dtype=object)
+    result = _strip_strings(mixed).tolist()
+    assert result[0] == "a" and result[1] == 5 and result[4] == "b" and result[5] == ""
+    assert result[2] is None
+    assert pd.isna(result[3])
+    
+    # Object column with no strings at all, and non-object dtypes
+    ints = pd.Series([1, 2, 3], dtype=object)
+    assert _strip_strings(ints).tolist() == [1, 2, 3]
+    floats = pd.Series([1.5, np.nan])
+    assert _strip_strings(floats) is floats
+    
+    print("✅ test_strip_strings passed")
+
+
+def test_transform_data():
+    """Test column mapping, empty-ID skipping, stripping and derived columns"""
+    jan23 = _serial(date(2026, 1, 23))
+    raw_df = pd.DataFrame({
+        "ID": [1, "", np.nan, "4", 5],
+        "Date": [jan23, "01/24/2026", "01/25/2026", " 2026-01-26 ", ""],
+        "Owner": [" Alice ", "Bob", "Carol", "Dan", 42],
+        "Progress": ["Done ", "Pending", "Done", "in progress", np.nan],
+        # Problem_Category and the other columns are missing from the sheet
+    })
+    records = transform_data(raw_df)
+    
+    assert [r["id"] for r in records] == [1, "4", 5]
+    assert set(records[0]) == {*COLUMN_MAPPING.values(), "progress_norm", "parsed_date"}
+    
+    first, fourth, fifth = records
+    assert first["date"] == "01/23/2026"
+    assert first["parsed_date"] == "2026-01-23"
+    assert first["owner"] == "Alice" and first["progress"] == "Done"
+    assert first["progress_norm"] == "Done"
+    assert fourth["progress_norm"] == "In Progress"
+    assert first["problem_category"] == ""
+    
+    assert fourth["date"] == "2026-01-26"
+    assert fourth["parsed_date"] == "2026-01-26"
+    
+    # Blank date -> no parsed date; numeric owner kept as a number
+    assert fifth["date"] == ""
+    assert fifth["parsed_date"] is None
+    assert fifth["owner"] == 42
+    assert pd.isna(fifth["progress"])
+    assert fifth["progress_norm"] == "Unknown"
+    
+    print("✅ test_transform_data passed")
+
+
+if __name__ == "__main__":
+    test_serial_dates_to_text()
+    test_strip_strings()
+    test_transform_data()
+    print("\n✅ All sync tests passed")
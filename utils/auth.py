@@ -8,39 +8,69 @@
 
 import os
 import hmac
-import streamlit as st
+from functools import lru_cache
 
+# streamlit 在用到的函数内部再 import: 只读取配置的调用方 (测试 / 同步脚本) 不必加载整个 Streamlit
 
-def _is_auth_required():
-    """Check if authentication is required"""
-    # 环境变量控制 (Docker 部署用)
+# 环境变量在进程内不会变化，只读取一次 (lru_cache)，不在每次 rerun 的 check_auth() 里重复读取
+# st.secrets 不缓存: 读取失败或云端 secrets 新增 / 轮换密码后，下一次 rerun 即生效
+# (Streamlit 自己缓存解析后的 secrets，每次查询只是一次 dict 查找)
+
+
+def _secrets_password():
+    """Password from st.secrets, or None if not configured / unreadable"""
+    try:
+        import streamlit as st
+        if "password" in st.secrets:
+            return st.secrets["password"]
+    except Exception:
+        pass
+    return None
+
+
+@lru_cache(maxsize=1)
+def _env_auth_setting():
+    """REQUIRE_AUTH 环境变量: True / False，未设置 (或无法识别) 时 None"""
     env_val = os.getenv("REQUIRE_AUTH", "").lower()
     if env_val in ("true", "1", "yes"):
         return True
     if env_val in ("false", "0", "no"):
         return False
+    return None
+
+
+@lru_cache(maxsize=1)
+def _env_password():
+    """DASHBOARD_PASSWORD 环境变量"""
+    return os.getenv("DASHBOARD_PASSWORD", "")
+
+
+def _is_auth_required():
+    """Check if authentication is required"""
+    # 环境变量控制 (Docker 部署用)
+    env_setting = _env_auth_setting()
+    if env_setting is not None:
+        return env_setting
     
     # 如果 st.secrets 中有 password 字段，则启用认证
-    try:
-        if "password" in st.secrets:
-            return True
-    except Exception:
-        pass
-    
-    return False
+    return _secrets_password() is not None
 
 
 def _get_password():
     """Get the configured password from secrets or env"""
     # 优先 st.secrets
-    try:
-        if "password" in st.secrets:
-            return st.secrets["password"]
-    except Exception:
-        pass
+    password = _secrets_password()
+    if password is not None:
+        return password
     
     # fallback 到环境变量
-    return os.getenv("DASHBOARD_PASSWORD", "")
+    return _env_password()
+
+
+def reset_auth_cache():
+    """清空缓存的环境变量配置 (测试或修改环境变量后调用)"""
+    _env_auth_setting.cache_clear()
+    _env_password.cache_clear()
 
 
 def check_auth():
@@ -53,6 +83,8 @@ def check_auth():
     if not _is_auth_required():
         return
     
+    import streamlit as st
+    
     # Already verified this session
     if st.session_state.get("authenticated", False):
         return
@@ -64,6 +96,8 @@ def check_auth():
 
 def _show_login():
     """Render the login form"""
+    import streamlit as st
+    
     # Note: set_page_config is called by the importing page, not here
     st.markdown("## 🔒 Discord Issue Dashboard")
     st.markdown("Please enter the access password to continue.")
@@ -1,63 +1,73 @@
 """
 公共定义模块 - 单一数据源
-所有 Progress 归一化、日期解析、颜色常量集中在此
+所有 Progress 归一化、日期解析、时间周期、颜色常量集中在此
 dashboard.py 和 pages/1_Analytics.py 统一 import
 """
 
+import numpy as np
 import pandas as pd
-from datetime import datetime
+from dataclasses import dataclass
+from datetime import datetime, date, timedelta
+from functools import lru_cache
 
 
 # ============== Progress Normalization ==============
 # 2026-02 更新: Pending 作为独立状态（可能表示 Blocked/受阻）
 # Google Sheets 当前值: Done / In Progress / Pending
 
+# key 为小写形式，匹配时不区分大小写 (done / Done / DONE / dOne ...)
 PROGRESS_MAPPING = {
     "done": "Done",
-    "Done": "Done",
-    "DONE": "Done",
     "in progress": "In Progress",
-    "In Progress": "In Progress",
-    "In progress": "In Progress",
-    "IN PROGRESS": "In Progress",
     "pending": "Pending",
-    "Pending": "Pending",
-    "PENDING": "Pending",
     "block": "Blocked",
-    "Block": "Blocked",
     "blocked": "Blocked",
-    "Blocked": "Blocked",
-    "BLOCKED": "Blocked",
 }
 
 # 标准化后的有效值
 PROGRESS_VALUES = ["Done", "In Progress", "Pending", "Blocked"]
 
 
+@lru_cache(maxsize=64)
 def normalize_progress(value):
     """
-    Normalize progress value to standard form.
+    Normalize progress value to standard form (case-insensitive).
     
     Returns: "Done" | "In Progress" | "Pending" | "Blocked" | "Unknown"
     """
     if pd.isna(value) or value is None:
         return "Unknown"
-    val = str(value).strip()
+    val = str(value).strip().lower()
     return PROGRESS_MAPPING.get(val, "Unknown")
 
 
+def normalize_progress_series(series):
+    """
+    Vectorized normalize_progress for a whole column.
+    
+    Progress has only a handful of distinct values, so normalize each unique
+    value once and map the column through the resulting dict.
+    """
+    table = {val: normalize_progress(val) for val in series.unique()}
+    return series.map(table)
+
+
 # ============== Date Parsing ==============
 
 # 支持的日期格式，按优先级排序
 DATE_FORMATS = ["%m/%d/%Y", "%Y-%m-%d", "%m/%d/%y", "%d/%m/%Y"]
 
 
+@lru_cache(maxsize=4096)
 def parse_date(date_str):
     """
     Parse date string to datetime object.
     
     Supports: "01/23/2026", "2026-01-23", "01/23/26", "23/01/2026"
     Returns: datetime or None
+    
+    Memoized: the same date strings recur across rows, so repeats skip the
+    strptime / ValueError loop. Bulk columns should use parse_date_series.
     """
     if pd.isna(date_str) or not date_str:
         return None
@@ -73,6 +83,150 @@ def parse_date(date_str):
         return None
 
 
+def parse_date_series(series):
+    """
+    Vectorized parse_date for a whole column.
+    
+    One pd.to_datetime pass per DATE_FORMATS entry (same priority order),
+    each filling only the values earlier formats left as NaT.
+    Returns: datetime64 Series, NaT where no format matches
+    """
+    cleaned = series.astype(str).str.strip()
+    parsed = None
+    for fmt in DATE_FORMATS:
+        # Fixed unit: pandas picks s/us per call, and fillna needs them to match
+        attempt = pd.to_datetime(cleaned, format=fmt, errors="coerce").astype("datetime64[us]")
+        parsed = attempt if parsed is None else parsed.fillna(attempt)
+        if parsed.notna().all():
+            break
+    return parsed
+
+
+# ============== Period Ranges ==============
+
+@dataclass(frozen=True, slots=True)
+class PeriodRange:
+    """Current period and the comparison period (Analytics page)"""
+    current_start: date
+    current_end: date
+    prev_start: date
+    prev_end: date
+    period_label: str
+    compare_label: str
+
+
+def _day_range(today, custom_start, custom_end):
+    prev = today - timedelta(days=1)
+    return PeriodRange(
+        today, today, prev, prev,
+        f"{today.strftime('%b %d, %Y')}",
+        f"{prev.strftime('%b %d, %Y')}",
+    )
+
+
+def _week_range(today, custom_start, custom_end):
+    # This week (Monday to today) vs last week (Monday to Sunday)
+    current_start = today - timedelta(days=today.weekday())
+    prev_start = current_start - timedelta(days=7)
+    prev_end = current_start - timedelta(days=1)
+    return PeriodRange(
+        current_start, today, prev_start, prev_end,
+        f"{current_start.strftime('%b %d')} - {today.strftime('%b %d, %Y')}",
+        f"{prev_start.strftime('%b %d')} - {prev_end.strftime('%b %d, %Y')}",
+    )
+
+
+def _month_range(today, custom_start, custom_end):
+    # This month vs last month
+    current_start = today.replace(day=1)
+    prev_end = current_start - timedelta(days=1)
+    prev_start = prev_end.replace(day=1)
+    return PeriodRange(
+        current_start, today, prev_start, prev_end,
+        f"{current_start.strftime('%b %Y')}",
+        f"{prev_start.strftime('%b %Y')}",
+    )
+
+
+def _custom_range(today, custom_start, custom_end):
+    # 任意日期范围，对比前一个同等长度周期
+    current_start = custom_start or (today - timedelta(days=6))
+    current_end = custom_end or today
+    span = (current_end - current_start).days + 1  # 包含首尾
+    prev_end = current_start - timedelta(days=1)
+    prev_start = prev_end - timedelta(days=span - 1)
+    return PeriodRange(
+        current_start, current_end, prev_start, prev_end,
+        f"{current_start.strftime('%b %d')} - {current_end.strftime('%b %d, %Y')} ({span} days)",
+        f"{prev_start.strftime('%b %d')} - {prev_end.strftime('%b %d, %Y')} ({span} days)",
+    )
+
+
+_PERIOD_BUILDERS = {
+    "Day": _day_range,
+    "Week": _week_range,
+    "Month": _month_range,
+    "Custom": _custom_range,
+}
+
+
+@lru_cache(maxsize=64)
+def _period_range(mode, custom_start, custom_end, today):
+    return _PERIOD_BUILDERS.get(mode, _custom_range)(today, custom_start, custom_end)
+
+
+def get_period_range(mode, custom_start=None, custom_end=None, today=None):
+    """
+    Get current period and comparison period date ranges.
+    
+    Day/Week/Month: 最新周期 vs 上一个周期 (固定)
+    Custom: 任意日期范围 vs 前一个同等长度的周期
+    
+    today 是缓存 key 的一部分，跨天后自动重新计算
+    Returns: PeriodRange
+    """
+    return _period_range(mode, custom_start, custom_end, today or date.today())
+
+
+# ============== Downsampling ==============
+
+def lttb_indices(x, y, n_out):
+    """
+    Largest-Triangle-Three-Buckets: pick n_out points of (x, y) that keep the
+    visual shape of a line chart. x must be sorted ascending.
+    
+    Returns: sorted numpy array of positions (all positions if n_out >= len(x))
+    """
+    x = np.asarray(x, dtype=np.float64)
+    y = np.asarray(y, dtype=np.float64)
+    n = len(x)
+    if n_out >= n or n_out < 3:
+        return np.arange(n)
+    
+    # First and last points are always kept; the rest is split into n_out - 2 buckets
+    every = (n - 2) / (n_out - 2)
+    sampled = np.empty(n_out, dtype=np.int64)
+    sampled[0] = a = 0
+    for i in range(n_out - 2):
+        # Average of the next bucket is the third triangle vertex
+        avg_start = int((i + 1) * every) + 1
+        avg_end = max(min(int((i + 2) * every) + 1, n), avg_start + 1)
+        avg_x = x[avg_start:avg_end].mean()
+        avg_y = y[avg_start:avg_end].mean()
+        
+        # Keep the point of this bucket with the largest triangle area
+        start = int(i * every) + 1
+        end = int((i + 1) * every) + 1
+        area = np.abs(
+            (x[a] - avg_x) * (y[start:end] - y[a])
+            - (x[a] - x[start:end]) * (avg_y - y[a])
+        )
+        a = start + int(area.argmax())
+        sampled[i + 1] = a
+    sampled[-1] = n - 1
+    return sampled
+
+
 # ============== Color Constants ==============
 
 PROGRESS_COLORS = {
@@ -92,18 +246,10 @@ PROBLEM_CATEGORY_COLORS = {
     "Other": "#6b7280",                # gray
 }
 
-# Progress 表格样式 (用于 Styler.applymap)
+# Progress 表格样式 (dashboard 表格的 Status 列按值整列映射)
 PROGRESS_STYLES = {
     "Done": "background-color: #dcfce7; color: #166534; font-weight: 600;",
     "In Progress": "background-color: #fef3c7; color: #92400e; font-weight: 600;",
     "Pending": "background-color: #fed7aa; color: #c2410c; font-weight: 600;",
     "Blocked": "background-color: #fecaca; color: #991b1b; font-weight: 600;",
 }
-
-
-def style_progress(val):
-    """Style for Progress column in st.dataframe"""
-    if pd.isna(val):
-        return ""
-    norm_val = normalize_progress(val)
-    return PROGRESS_STYLES.get(norm_val, "")
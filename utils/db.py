@@ -1,28 +1,107 @@
 """
 数据库操作封装
 """
+import os
+import json
 import sqlite3
-from pathlib import Path
-from typing import List, Dict, Any, Optional
+import atexit
+import threading
+from typing import List, Dict, Any, Optional, Tuple, NamedTuple, Iterator
 from contextlib import contextmanager
-import sys
+from functools import lru_cache
+from operator import itemgetter
 import logging
 
-# Add project root to path
-sys.path.insert(0, str(Path(__file__).parent.parent))
-from config import DATABASE_PATH, DATA_DIR
+import pandas as pd
+
+# 项目根目录由入口 (dashboard.py / pages / scripts / tests) 加入 sys.path，这里不再改动
+from config import DATABASE_PATH, DATA_DIR, ALL_FIELDS
+from utils.common import normalize_progress, parse_date
 
 logger = logging.getLogger("discord_dashboard.db")
 
+# issues 表业务列顺序 (Sheets 映射字段 + 同步时计算的 progress_norm / parsed_date)
+ISSUE_COLUMNS = [*ALL_FIELDS, "progress_norm", "parsed_date"]
+_ISSUE_SELECT = ", ".join(ISSUE_COLUMNS)
+
+# 每个连接打开时设置的 PRAGMA:
+# WAL 让读 (Streamlit) 和写 (同步) 互不阻塞；synchronous=NORMAL 在 WAL 下只在 checkpoint 时 fsync
+_PRAGMAS = """
+    PRAGMA journal_mode=WAL;
+    PRAGMA synchronous=NORMAL;
+    PRAGMA temp_store=MEMORY;
+    PRAGMA mmap_size=268435456;
+    PRAGMA cache_size=-20000;
+"""
+
+# 关键词搜索覆盖的列
+SEARCH_COLUMNS = ["issue", "category", "channel", "owner", "reply_approach", "problem_category"]
+
+# 关键词搜索的 FTS5 索引 (external content，内容取自 issues 表)
+# trigram 分词保持 LIKE '%kw%' 的子串 + 大小写不敏感语义，但至少需要 3 个字符
+_FTS_SQL = f"""
+    CREATE VIRTUAL TABLE IF NOT EXISTS issues_fts USING fts5(
+        {', '.join(SEARCH_COLUMNS)},
+        content='issues', content_rowid='id', tokenize='trigram'
+    )
+"""
+FTS_MIN_KEYWORD_LENGTH = 3
+
+
+def _connect() -> sqlite3.Connection:
+    """打开数据库连接并应用 _PRAGMAS"""
+    conn = sqlite3.connect(DATABASE_PATH)
+    conn.executescript(_PRAGMAS)
+    return conn
+
+
+# 每个线程复用一个连接，避免每次查询都 connect + PRAGMA + close
+_local = threading.local()
+
+
+def _get_conn() -> sqlite3.Connection:
+    """
+    当前线程的共享连接 (首次使用时打开)
+    行是普通元组 (不设 sqlite3.Row)；需要列名时取 cursor.description
+    """
+    conn = getattr(_local, "conn", None)
+    if conn is None:
+        conn = _connect()
+        _local.conn = conn
+    return conn
+
+
+def close_connection():
+    """关闭当前线程的共享连接 (进程退出时自动调用)"""
+    conn = getattr(_local, "conn", None)
+    if conn is not None:
+        conn.close()
+        _local.conn = None
+
+
+atexit.register(close_connection)
+
+
+# 表结构版本，记录在 PRAGMA user_version 中
+# 已是最新版本的数据库启动时跳过建表 / 迁移 / 建索引；修改结构时递增并补充迁移
+# v2: 复合索引 (progress_norm, problem_category) / (owner, progress_norm) + ANALYZE 统计
+SCHEMA_VERSION = 2
+
 
 def init_database():
     """初始化数据库，创建表结构"""
     # 确保 data 目录存在
     DATA_DIR.mkdir(parents=True, exist_ok=True)
     
-    conn = sqlite3.connect(DATABASE_PATH)
+    conn = _connect()
     cursor = conn.cursor()
     
+    version = cursor.execute("PRAGMA user_version").fetchone()[0]
+    if version >= SCHEMA_VERSION:
+        conn.close()
+        logger.info(f"Database up to date (schema v{version}): {DATABASE_PATH}")
+        return
+    
     # 创建 issues 表
     cursor.execute("""
         CREATE TABLE IF NOT EXISTS issues (
@@ -37,6 +116,8 @@ def init_database():
             progress TEXT,
             result TEXT,
             problem_category TEXT,
+            progress_norm TEXT,
+            parsed_date TEXT,
             created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
             updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
         )
@@ -48,12 +129,49 @@ def init_database():
     except sqlite3.OperationalError:
         pass  # 列已存在
     
+    # 迁移: 添加 progress_norm 列 (同步时写入归一化后的 progress)，并回填旧数据
+    try:
+        cursor.execute("ALTER TABLE issues ADD COLUMN progress_norm TEXT")
+    except sqlite3.OperationalError:
+        pass  # 列已存在
+    conn.create_function("normalize_progress", 1, normalize_progress)
+    cursor.execute(
+        "UPDATE issues SET progress_norm = normalize_progress(progress) WHERE progress_norm IS NULL"
+    )
+    
+    # 迁移: 添加 parsed_date 列 (同步时写入 ISO 格式日期)，并回填旧数据
+    try:
+        cursor.execute("ALTER TABLE issues ADD COLUMN parsed_date TEXT")
+    except sqlite3.OperationalError:
+        pass  # 列已存在
+    conn.create_function("iso_date", 1, _iso_date)
+    cursor.execute(
+        "UPDATE issues SET parsed_date = iso_date(date) WHERE parsed_date IS NULL AND date != ''"
+    )
+    
     # 创建索引
     cursor.execute("CREATE INDEX IF NOT EXISTS idx_date ON issues(date)")
     cursor.execute("CREATE INDEX IF NOT EXISTS idx_category ON issues(category)")
     cursor.execute("CREATE INDEX IF NOT EXISTS idx_progress ON issues(progress)")
     cursor.execute("CREATE INDEX IF NOT EXISTS idx_owner ON issues(owner)")
     cursor.execute("CREATE INDEX IF NOT EXISTS idx_problem_category ON issues(problem_category)")
+    cursor.execute("CREATE INDEX IF NOT EXISTS idx_parsed_date ON issues(parsed_date)")
+    # 复合索引: get_dashboard_stats 的 GROUP BY 只扫索引 (覆盖)；owner + 状态切片
+    # 单列 idx_progress_norm 是前者的前缀，已冗余
+    cursor.execute("DROP INDEX IF EXISTS idx_progress_norm")
+    cursor.execute(
+        "CREATE INDEX IF NOT EXISTS idx_progress_norm_pc ON issues(progress_norm, problem_category)"
+    )
+    cursor.execute("CREATE INDEX IF NOT EXISTS idx_owner_progress ON issues(owner, progress_norm)")
+    cursor.execute("ANALYZE")
+    
+    # 全文索引: 首次创建时从已有数据构建
+    fts_exists = cursor.execute(
+        "SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = 'issues_fts'"
+    ).fetchone()
+    cursor.execute(_FTS_SQL)
+    if not fts_exists:
+        cursor.execute("INSERT INTO issues_fts(issues_fts) VALUES('rebuild')")
     
     # 创建同步日志表
     cursor.execute("""
@@ -66,6 +184,8 @@ def init_database():
         )
     """)
     
+    # PRAGMA 不支持 ? 参数，版本号是模块常量
+    cursor.execute(f"PRAGMA user_version = {SCHEMA_VERSION}")
     conn.commit()
     conn.close()
     logger.info(f"Database initialized: {DATABASE_PATH}")
@@ -73,20 +193,109 @@ def init_database():
 
 @contextmanager
 def get_connection():
-    """获取数据库连接的上下文管理器"""
-    conn = sqlite3.connect(DATABASE_PATH)
-    conn.row_factory = sqlite3.Row  # 返回 dict-like 对象
+    """
+    获取数据库连接的上下文管理器
+    复用当前线程的连接，退出时不关闭；出错时回滚未提交的事务
+    """
+    conn = _get_conn()
     try:
         yield conn
-    finally:
-        conn.close()
+    except Exception:
+        if conn.in_transaction:
+            conn.rollback()
+        raise
 
 
 def clear_issues():
     """清空 issues 表（全量同步前调用）"""
     with get_connection() as conn:
         conn.execute("DELETE FROM issues")
+        conn.execute("INSERT INTO issues_fts(issues_fts) VALUES('rebuild')")
         conn.commit()
+    _bump_data_version()
+
+
+def _iso_date(value) -> Optional[str]:
+    """原始日期文本 -> ISO "YYYY-MM-DD"，无法解析时返回 None"""
+    parsed = parse_date(value)
+    return parsed.date().isoformat() if parsed else None
+
+
+# 写入时计算的派生列: 列名 -> 由 issue dict 计算值
+# (若已由同步脚本 transform_data 整列算好则直接使用)
+_DERIVED_COLUMNS = {
+    "progress_norm": lambda item: item["progress_norm"] if "progress_norm" in item else normalize_progress(item.get("progress")),
+    "parsed_date": lambda item: item["parsed_date"] if "parsed_date" in item else _iso_date(item.get("date")),
+}
+
+
+# ISSUE_COLUMNS = Sheets 字段 (ALL_FIELDS) + 派生列，顺序与 _DERIVED_COLUMNS 一致
+# Sheets 字段用一个 itemgetter 一次取出 (C 实现)，代替逐列 dict.get
+_get_fields = itemgetter(*ALL_FIELDS)
+_EMPTY_FIELDS = dict.fromkeys(ALL_FIELDS, "")
+
+
+def _issue_row(item: Dict[str, Any]) -> tuple:
+    """issue dict -> INSERT 参数元组 (ISSUE_COLUMNS 顺序)，派生列在写入时计算"""
+    try:
+        fields = _get_fields(item)
+    except KeyError:
+        # 缺列的 dict (非同步脚本产出) 补空字符串，与原先 item.get(col, "") 一致
+        fields = _get_fields({**_EMPTY_FIELDS, **item})
+    return (*fields, *(derive(item) for derive in _DERIVED_COLUMNS.values()))
+
+
+# 写入 SQL 在 import 时构建一次
+_INSERT_ISSUE_SQL = (
+    f"INSERT OR REPLACE INTO issues ({_ISSUE_SELECT}) "
+    f"VALUES ({', '.join('?' for _ in ISSUE_COLUMNS)})"
+)
+
+
+# 增量维护全文索引 (external content 表): 按 id 列表 (JSON 数组参数) 删除旧词条 / 写入新词条
+# 'delete' 需要提供当初索引的原值，所以在覆盖 issues 行之前从 issues 表读出
+_FTS_COLUMNS = ", ".join(SEARCH_COLUMNS)
+_FTS_DELETE_IDS_SQL = (
+    f"INSERT INTO issues_fts(issues_fts, rowid, {_FTS_COLUMNS}) "
+    f"SELECT 'delete', id, {_FTS_COLUMNS} FROM issues WHERE id IN (SELECT value FROM json_each(?))"
+)
+_FTS_INSERT_IDS_SQL = (
+    f"INSERT INTO issues_fts(rowid, {_FTS_COLUMNS}) "
+    f"SELECT id, {_FTS_COLUMNS} FROM issues WHERE id IN (SELECT value FROM json_each(?))"
+)
+
+
+def _write_issues(conn: sqlite3.Connection, issues: List[Dict[str, Any]], replace: bool):
+    """
+    在一个 BEGIN IMMEDIATE 事务内写入 issues (replace=True 时先清空)
+    参数行由生成器逐条产出，不再先拼出完整的 rows 列表
+    
+    全文索引在同一事务内维护 (不用触发器: INSERT OR REPLACE 的隐式删除不会触发 DELETE 触发器)：
+    全量替换时整体 rebuild；追加时只更新本次写入的 id，代价与批次大小成正比而非整表
+    """
+    ids = [item.get("id") for item in issues]
+    # 没有 id 的行由 SQLite 分配 rowid，无法按 id 增量更新索引，退回整体重建
+    incremental = not replace and None not in ids
+    ids_json = json.dumps(ids, default=str) if incremental else None
+    
+    conn.execute("BEGIN IMMEDIATE")
+    if replace:
+        conn.execute("DELETE FROM issues")
+    elif incremental:
+        conn.execute(_FTS_DELETE_IDS_SQL, (ids_json,))
+    conn.executemany(
+        _INSERT_ISSUE_SQL,
+        map(_issue_row, issues)
+    )
+    if incremental:
+        conn.execute(_FTS_INSERT_IDS_SQL, (ids_json,))
+    else:
+        conn.execute("INSERT INTO issues_fts(issues_fts) VALUES('rebuild')")
+    if replace:
+        # 全量替换后刷新 sqlite_stat1，查询规划器按新的数据分布选索引
+        conn.execute("ANALYZE issues")
+    conn.commit()
+    _bump_data_version()
 
 
 def insert_issues(issues: List[Dict[str, Any]]):
@@ -95,25 +304,8 @@ def insert_issues(issues: List[Dict[str, Any]]):
         return 0
     
     with get_connection() as conn:
-        cursor = conn.cursor()
-        
-        # 准备 SQL
-        columns = ["id", "date", "channel", "original_source", "category", 
-                   "issue", "owner", "reply_approach", "progress", "result",
-                   "problem_category"]
-        placeholders = ", ".join(["?" for _ in columns])
-        sql = f"INSERT OR REPLACE INTO issues ({', '.join(columns)}) VALUES ({placeholders})"
-        
-        # 批量插入
-        rows = []
-        for item in issues:
-            row = tuple(item.get(col, "") for col in columns)
-            rows.append(row)
-        
-        cursor.executemany(sql, rows)
-        conn.commit()
-        
-        return len(rows)
+        _write_issues(conn, issues, replace=False)
+        return len(issues)
 
 
 def safe_replace_issues(issues: List[Dict[str, Any]]):
@@ -124,28 +316,15 @@ def safe_replace_issues(issues: List[Dict[str, Any]]):
     if not issues:
         return 0
     
-    columns = ["id", "date", "channel", "original_source", "category", 
-               "issue", "owner", "reply_approach", "progress", "result",
-               "problem_category"]
-    placeholders = ", ".join(["?" for _ in columns])
-    sql = f"INSERT OR REPLACE INTO issues ({', '.join(columns)}) VALUES ({placeholders})"
-    
-    rows = [tuple(item.get(col, "") for col in columns) for item in issues]
-    
-    conn = sqlite3.connect(DATABASE_PATH)
+    conn = _get_conn()
     try:
-        cursor = conn.cursor()
-        cursor.execute("DELETE FROM issues")
-        cursor.executemany(sql, rows)
-        conn.commit()
-        logger.info(f"Safe replace: {len(rows)} rows written in single transaction")
-        return len(rows)
+        _write_issues(conn, issues, replace=True)
+        logger.info(f"Safe replace: {len(issues)} rows written in single transaction")
+        return len(issues)
     except Exception as e:
         conn.rollback()
         logger.error(f"Safe replace failed, rolled back: {e}")
         raise
-    finally:
-        conn.close()
 
 
 def log_sync(rows_synced: int, status: str, message: str = ""):
@@ -156,13 +335,67 @@ def log_sync(rows_synced: int, status: str, message: str = ""):
             (rows_synced, status, message)
         )
         conn.commit()
+    _bump_data_version()
+
+
+def iter_all_issues(batch: int = 1000) -> Iterator[Dict[str, Any]]:
+    """
+    逐批 (fetchmany) 产出所有 issues，内存占用只跟 batch 大小有关
+    调用方拿到第一行时不必等整表读完
+    """
+    with get_connection() as conn:
+        cursor = conn.cursor()
+        cursor.arraysize = batch
+        cursor.execute(_compile_filter(_ISSUE_SELECT, ()))
+        while True:
+            rows = cursor.fetchmany()
+            if not rows:
+                break
+            for row in rows:
+                yield dict(zip(ISSUE_COLUMNS, row))
 
 
 def get_all_issues() -> List[Dict[str, Any]]:
     """获取所有 issues"""
-    with get_connection() as conn:
-        cursor = conn.execute("SELECT * FROM issues ORDER BY id DESC")
-        return [dict(row) for row in cursor.fetchall()]
+    return list(iter_all_issues())
+
+
+def get_all_issues_df() -> pd.DataFrame:
+    """所有 issues (ISSUE_COLUMNS 列)，直接读成 DataFrame"""
+    return filter_issues_df()
+
+
+# 本进程内的写入计数 (写函数提交后递增)，和文件 mtime 一起组成数据版本
+_data_version = 0
+
+
+def _bump_data_version():
+    global _data_version
+    _data_version += 1
+
+
+def get_data_version() -> Tuple[int, float]:
+    """
+    数据版本: (本进程写入次数, get_db_mtime())
+    进程内写入即时可见，其他进程的写入 (外部同步) 通过 mtime 发现；只做 stat，不查库
+    """
+    return _data_version, get_db_mtime()
+
+
+def get_db_mtime() -> float:
+    """
+    获取数据库文件修改时间（用作 Streamlit 缓存 key）
+    同步写入后 mtime 变化，缓存自动失效；文件不存在时返回 0.0
+    
+    WAL 模式下写入先落到 -wal 文件 (checkpoint 前主文件不变)，所以取两者较新的
+    """
+    mtimes = []
+    for path in (str(DATABASE_PATH), f"{DATABASE_PATH}-wal"):
+        try:
+            mtimes.append(os.path.getmtime(path))
+        except OSError:
+            pass
+    return max(mtimes, default=0.0)
 
 
 def get_issues_count() -> int:
@@ -172,43 +405,55 @@ def get_issues_count() -> int:
         return cursor.fetchone()[0]
 
 
+def _column_names(cursor: sqlite3.Cursor) -> List[str]:
+    """查询结果的列名 (cursor.description 每项第一个元素)"""
+    return [desc[0] for desc in cursor.description]
+
+
 def get_last_sync() -> Optional[Dict[str, Any]]:
     """获取最后一次同步记录"""
     with get_connection() as conn:
         cursor = conn.execute(
-            "SELECT * FROM sync_log ORDER BY sync_time DESC LIMIT 1"
+            "SELECT * FROM sync_log ORDER BY sync_time DESC, id DESC LIMIT 1"
         )
         row = cursor.fetchone()
-        return dict(row) if row else None
+        if row is None:
+            return None
+        return dict(zip(_column_names(cursor), row))
+
+
+# 按数据版本缓存 (maxsize=1: 只保留当前版本)，侧边栏每次 rerun 不必再查库
+# (issues 总数由 dashboard 按 get_data_version() 缓存的 _dashboard_stats 提供)
+@lru_cache(maxsize=1)
+def _last_sync_at(version: Tuple[int, float]) -> Optional[Dict[str, Any]]:
+    return get_last_sync()
+
+
+def get_last_sync_cached() -> Optional[Dict[str, Any]]:
+    """get_last_sync()，数据版本不变时直接返回缓存值 (返回副本，调用方可修改)"""
+    last = _last_sync_at(get_data_version())
+    return dict(last) if last else None
 
 
 def search_issues(keyword: str) -> List[Dict[str, Any]]:
     """关键词搜索"""
-    with get_connection() as conn:
-        sql = """
-            SELECT * FROM issues 
-            WHERE issue LIKE ? 
-               OR category LIKE ? 
-               OR channel LIKE ?
-               OR owner LIKE ?
-               OR reply_approach LIKE ?
-               OR problem_category LIKE ?
-            ORDER BY id DESC
-        """
-        pattern = f"%{keyword}%"
-        cursor = conn.execute(sql, (pattern, pattern, pattern, pattern, pattern, pattern))
-        return [dict(row) for row in cursor.fetchall()]
+    return filter_issues(keyword=keyword)
 
 
-def filter_issues(
+# 短关键词的 LIKE 回退条件 (import 时构建一次)
+_KEYWORD_LIKE = "(" + " OR ".join(f"{col} LIKE ?" for col in SEARCH_COLUMNS) + ")"
+
+
+def _filter_where(
     category: Optional[str] = None,
     progress: Optional[str] = None,
     owner: Optional[str] = None,
     date_from: Optional[str] = None,
     date_to: Optional[str] = None,
     problem_category: Optional[str] = None,
-) -> List[Dict[str, Any]]:
-    """按条件筛选 issues"""
+    keyword: Optional[str] = None,
+) -> Tuple[Tuple[str, ...], List[Any]]:
+    """构建筛选条件 (固定的 SQL 片段元组) 和参数，值一律走 ? 占位"""
     conditions = []
     params = []
     
@@ -216,75 +461,188 @@ def filter_issues(
         conditions.append("category = ?")
         params.append(category)
     if progress:
-        conditions.append("progress = ?")
+        conditions.append("progress_norm = ?")
         params.append(progress)
     if owner:
         conditions.append("owner = ?")
         params.append(owner)
+    # 日期按同步时写入的 ISO parsed_date 比较 (原始 MM/DD/YYYY 文本无法按字符串比较)
     if date_from:
-        conditions.append("date >= ?")
-        params.append(date_from)
+        conditions.append("parsed_date >= ?")
+        params.append(_iso_date(date_from))
     if date_to:
-        conditions.append("date <= ?")
-        params.append(date_to)
+        conditions.append("parsed_date <= ?")
+        params.append(_iso_date(date_to))
     if problem_category:
         conditions.append("problem_category = ?")
         params.append(problem_category)
+    if keyword and len(keyword) >= FTS_MIN_KEYWORD_LENGTH:
+        # 整词作为 FTS5 短语匹配 (双引号转义)，走 trigram 倒排索引
+        conditions.append("id IN (SELECT rowid FROM issues_fts WHERE issues_fts MATCH ?)")
+        params.append('"' + keyword.replace('"', '""') + '"')
+    elif keyword:
+        # 过短的关键词 trigram 无法匹配，退回 LIKE 扫描
+        conditions.append(_KEYWORD_LIKE)
+        params.extend([f"%{keyword}%"] * len(SEARCH_COLUMNS))
     
+    return tuple(conditions), params
+
+
+@lru_cache(maxsize=64)
+def _compile_filter(select: str, conditions: Tuple[str, ...]) -> str:
+    """
+    按 (列, 条件组合) 缓存拼好的 SQL 文本
+    相同文本可命中 sqlite3 连接的语句缓存，免去重复解析 / 规划
+    """
     where_clause = " AND ".join(conditions) if conditions else "1=1"
-    sql = f"SELECT * FROM issues WHERE {where_clause} ORDER BY id DESC"
+    return f"SELECT {select} FROM issues WHERE {where_clause} ORDER BY id DESC"
+
+
+def filter_issues(
+    category: Optional[str] = None,
+    progress: Optional[str] = None,
+    owner: Optional[str] = None,
+    date_from: Optional[str] = None,
+    date_to: Optional[str] = None,
+    problem_category: Optional[str] = None,
+    keyword: Optional[str] = None,
+) -> List[Dict[str, Any]]:
+    """
+    按条件筛选 issues (所有条件在 SQL WHERE 中执行)
+    
+    - progress: 归一化后的值 (Done / In Progress / Pending / Blocked)
+    - keyword: 在 SEARCH_COLUMNS 中做子串匹配 (FTS5 trigram 索引，短关键词退回 LIKE)
+    - date_from / date_to: parse_date 支持的任意格式，按 parsed_date 比较 (无法解析日期的行不返回)
+    """
+    rows = filter_issue_rows(
+        category=category, progress=progress, owner=owner, date_from=date_from,
+        date_to=date_to, problem_category=problem_category, keyword=keyword,
+    )
+    # 元组直接 zip 成 dict
+    return [dict(zip(ISSUE_COLUMNS, row)) for row in rows]
+
+
+def filter_issues_df(**filters) -> pd.DataFrame:
+    """
+    同 filter_issues，但直接返回 DataFrame (列为 ISSUE_COLUMNS)
+    元组行 + cursor.description 一次构建，不经过逐行 dict
+    """
+    conditions, params = _filter_where(**filters)
+    sql = _compile_filter(_ISSUE_SELECT, conditions)
     
     with get_connection() as conn:
         cursor = conn.execute(sql, params)
-        return [dict(row) for row in cursor.fetchall()]
+        return pd.DataFrame.from_records(cursor.fetchall(), columns=_column_names(cursor))
+
+
+def search_issues_df(keyword: str) -> pd.DataFrame:
+    """关键词搜索 (DataFrame 版本)"""
+    return filter_issues_df(keyword=keyword)
+
+
+def filter_issue_rows(**filters) -> List[tuple]:
+    """
+    同 filter_issues，但返回按 ISSUE_COLUMNS 排列的元组
+    供 pd.DataFrame.from_records(rows, columns=ISSUE_COLUMNS) 使用，省去逐行 dict
+    """
+    conditions, params = _filter_where(**filters)
+    sql = _compile_filter(_ISSUE_SELECT, conditions)
+    
+    with get_connection() as conn:
+        return conn.execute(sql, params).fetchall()
+
+
+# get_unique_values 允许的列及其 DISTINCT 查询 (import 时构建，列名不来自调用方输入)
+_UNIQUE_VALUES_SQL = {
+    col: (
+        f"SELECT DISTINCT {col} FROM issues "
+        f"WHERE {col} IS NOT NULL AND {col} != '' ORDER BY {col}"
+    )
+    for col in ISSUE_COLUMNS
+}
+
+
+@lru_cache(maxsize=32)
+def _unique_values_at(column: str, version: Tuple[int, float]) -> Tuple[str, ...]:
+    """按 (列, 数据版本) 缓存的唯一值；数据变化后旧版本条目自然淘汰"""
+    with get_connection() as conn:
+        cursor = conn.execute(_UNIQUE_VALUES_SQL[column])
+        return tuple(row[0] for row in cursor.fetchall())
 
 
 def get_unique_values(column: str) -> List[str]:
     """获取某列的所有唯一值（用于筛选器）"""
+    if column not in _UNIQUE_VALUES_SQL:
+        raise ValueError(f"Unknown issues column: {column!r}")
+    return list(_unique_values_at(column, get_data_version()))
+
+
+class DashboardStats(NamedTuple):
+    """Dashboard 顶部指标所需的汇总数据"""
+    total: int
+    by_progress: Dict[str, int]           # 归一化 progress -> 数量
+    by_problem_category: Dict[str, int]   # 非空 problem_category -> 数量
+
+
+def get_dashboard_stats() -> DashboardStats:
+    """
+    单次 GROUP BY 获取 Dashboard 指标 (总数 / 按状态 / 按问题大类)
+    分组结果很小，总数和各维度计数在 Python 端汇总
+    """
     with get_connection() as conn:
         cursor = conn.execute(
-            f"SELECT DISTINCT {column} FROM issues WHERE {column} IS NOT NULL AND {column} != '' ORDER BY {column}"
+            "SELECT progress_norm, problem_category, COUNT(*) FROM issues "
+            "GROUP BY progress_norm, problem_category"
         )
-        return [row[0] for row in cursor.fetchall()]
+        total = 0
+        by_progress: Dict[str, int] = {}
+        by_problem_category: Dict[str, int] = {}
+        for progress_norm, problem_category, count in cursor.fetchall():
+            total += count
+            by_progress[progress_norm] = by_progress.get(progress_norm, 0) + count
+            if problem_category:
+                by_problem_category[problem_category] = by_problem_category.get(problem_category, 0) + count
+        return DashboardStats(total, by_progress, by_problem_category)
+
+
+# 各维度分组计数合并为一条 UNION ALL 查询，一次往返
+# (SQLite 不支持 GROUPING SETS)；by_progress 覆盖全部行，总数由其求和得出
+_STATISTICS_SQL = """
+    SELECT 'by_progress' AS dim, progress_norm AS k, COUNT(*) AS n
+    FROM issues GROUP BY progress_norm
+    UNION ALL
+    SELECT 'by_category', category, COUNT(*) FROM issues GROUP BY category
+    UNION ALL
+    SELECT 'by_problem_category', problem_category, COUNT(*) FROM issues
+    WHERE problem_category IS NOT NULL AND problem_category != ''
+    GROUP BY problem_category
+    UNION ALL
+    SELECT 'by_owner', owner, COUNT(*) FROM issues GROUP BY owner
+    ORDER BY dim, n DESC
+"""
 
 
 def get_statistics() -> Dict[str, Any]:
     """获取统计数据"""
+    stats = {
+        "total": 0,
+        "by_progress": {},
+        "by_category": {},
+        "by_problem_category": {},
+        "by_owner": {},
+    }
     with get_connection() as conn:
-        stats = {}
-        
-        # 总数
-        stats["total"] = conn.execute("SELECT COUNT(*) FROM issues").fetchone()[0]
-        
-        # 按 progress 统计
-        cursor = conn.execute(
-            "SELECT progress, COUNT(*) as count FROM issues GROUP BY progress"
-        )
-        stats["by_progress"] = {row[0]: row[1] for row in cursor.fetchall()}
-        
-        # 按 category 统计 (具体问题描述)
-        cursor = conn.execute(
-            "SELECT category, COUNT(*) as count FROM issues GROUP BY category ORDER BY count DESC"
-        )
-        stats["by_category"] = {row[0]: row[1] for row in cursor.fetchall()}
-        
-        # 按 problem_category 统计 (问题大类)
-        cursor = conn.execute(
-            "SELECT problem_category, COUNT(*) as count FROM issues WHERE problem_category IS NOT NULL AND problem_category != '' GROUP BY problem_category ORDER BY count DESC"
-        )
-        stats["by_problem_category"] = {row[0]: row[1] for row in cursor.fetchall()}
-        
-        # 按 owner 统计
-        cursor = conn.execute(
-            "SELECT owner, COUNT(*) as count FROM issues GROUP BY owner ORDER BY count DESC"
-        )
-        stats["by_owner"] = {row[0]: row[1] for row in cursor.fetchall()}
-        
-        return stats
+        rows = conn.execute(_STATISTICS_SQL).fetchall()
+    
+    for dim, key, count in rows:
+        stats[dim][key] = count
+    stats["total"] = sum(stats["by_progress"].values())
+    
+    return stats
 
 
 if __name__ == "__main__":
-    # 测试
+    # 测试 (在项目根目录运行: python -m utils.db)
     init_database()
     print(f"数据库路径: {DATABASE_PATH}")
     print(f"Issues 数量: {get_issues_count()}")
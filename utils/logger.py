@@ -8,13 +8,51 @@ import sys
 from logging.handlers import RotatingFileHandler
 from pathlib import Path
 
+# 默认日志目录在 import 时解析一次
+try:
+    from config import LOGS_DIR as _DEFAULT_LOG_DIR
+except ImportError:
+    _DEFAULT_LOG_DIR = None
+
+
+class _LazyFileHandler(logging.Handler):
+    """
+    第一次 emit 时才创建日志目录和 RotatingFileHandler
+    只 import 不写日志的路径 (测试 / Streamlit rerun) 不产生磁盘 I/O
+    """
+    
+    def __init__(self, log_path, level=logging.NOTSET, **kwargs):
+        super().__init__(level)
+        self._log_path = Path(log_path)
+        self._kwargs = kwargs
+        self._real = None
+    
+    def emit(self, record):
+        # Handler.handle() 已持有 self.lock，创建过程不会并发
+        if self._real is None:
+            try:
+                self._log_path.mkdir(parents=True, exist_ok=True)
+                real = RotatingFileHandler(self._log_path / "app.log", **self._kwargs)
+            except Exception:
+                self.handleError(record)
+                return
+            real.setLevel(self.level)
+            real.setFormatter(self.formatter)
+            self._real = real
+        self._real.emit(record)
+    
+    def close(self):
+        if self._real is not None:
+            self._real.close()
+        super().close()
+
 
 def setup_logger(name="discord_dashboard", log_dir=None, level=logging.INFO):
     """
     配置并返回 logger 实例
     
     - 控制台输出 (stdout)
-    - 文件输出 (自动轮转: 5MB * 3 个文件)
+    - 文件输出 (自动轮转: 5MB * 3 个文件，首条日志时才创建文件)
     
     Args:
         name: logger 名称
@@ -50,18 +88,11 @@ def setup_logger(name="discord_dashboard", log_dir=None, level=logging.INFO):
     
     # 文件 handler (可选，如果 log_dir 可用)
     if log_dir is None:
-        try:
-            from config import LOGS_DIR
-            log_dir = LOGS_DIR
-        except ImportError:
-            log_dir = None
+        log_dir = _DEFAULT_LOG_DIR
     
     if log_dir:
-        log_path = Path(log_dir)
-        log_path.mkdir(parents=True, exist_ok=True)
-        
-        file_handler = RotatingFileHandler(
-            log_path / "app.log",
+        file_handler = _LazyFileHandler(
+            log_dir,
             maxBytes=5 * 1024 * 1024,  # 5 MB
             backupCount=3,
             encoding="utf-8",